@@ -0,0 +1,123 @@
+# /artificialintelligence/aho_corasick_pattern_match.py
+#
+# Pattern match many patterns at once using the Aho-Corasick automaton
+#
+# See LICENCE.md for Copyright information
+"""Aho-Corasick multi-pattern matching method."""
+
+from collections import deque
+
+
+class AhoCorasickAutomaton(object):
+
+    """An automaton which matches a list of patterns in a single pass.
+
+    The automaton is a trie of all the patterns, where each node is a state
+    and each edge is a character. Like the prefix table in
+    match_pattern_kmp, each state also has a failure link, which points to
+    the state for the longest proper suffix of the current state which is
+    also a prefix of some pattern. On a mismatch we follow failure links
+    instead of going back in the text.
+
+    Each state also records the ids of the patterns which end there,
+    including those reachable through its failure links, so that patterns
+    which are suffixes of other patterns are reported too."""
+
+    def __init__(self, patterns):
+        """Build the automaton for patterns."""
+
+        super(AhoCorasickAutomaton, self).__init__()
+
+        self.patterns = tuple(patterns)
+
+        self._transitions = [{}]
+        self._failure = [0]
+        self._outputs = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if len(pattern) == 0:
+                raise ValueError("Pattern {0} is empty".format(pattern_id))
+
+            state = 0
+            for char in pattern:
+                try:
+                    state = self._transitions[state][char]
+                except KeyError:
+                    self._transitions.append({})
+                    self._failure.append(0)
+                    self._outputs.append([])
+                    self._transitions[state][char] = len(self._transitions) - 1
+                    state = len(self._transitions) - 1
+
+            self._outputs[state].append(pattern_id)
+
+        self._calculate_failure_links()
+
+    def _calculate_failure_links(self):
+        """Calculate the failure link for every state in the trie.
+
+        This is the same idea as calculate_prefix in match_pattern_kmp,
+        generalised to a trie. States are visited breadth-first, so the
+        failure link of a state's parent (which is always shallower) is
+        already known. From there we keep following failure links until we
+        find a state which has a transition on the same character."""
+
+        queue = deque(self._transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for char, next_state in self._transitions[state].items():
+                queue.append(next_state)
+
+                fallback = self._failure[state]
+                while fallback > 0 and char not in self._transitions[fallback]:
+                    fallback = self._failure[fallback]
+
+                self._failure[next_state] = self._transitions[fallback].get(char, 0)
+
+                # Every pattern which ends at our failure state also ends
+                # here, since it is a suffix of what we have matched.
+                self._outputs[next_state] = (self._outputs[next_state] +
+                                             self._outputs[self._failure[next_state]])
+
+    def iter_matches(self, text):
+        """Yield (pattern_id, offset) for every match in text.
+
+        Matches are yielded in the order in which they end in text."""
+
+        transitions = self._transitions
+        failure = self._failure
+        outputs = self._outputs
+        patterns = self.patterns
+
+        state = 0
+        for text_index, char in enumerate(text):
+            while state > 0 and char not in transitions[state]:
+                state = failure[state]
+
+            state = transitions[state].get(char, 0)
+
+            for pattern_id in outputs[state]:
+                yield (pattern_id,
+                       text_index - len(patterns[pattern_id]) + 1)
+
+    def match(self, text):
+        """Return a list of (pattern_id, offset) for every match in text."""
+
+        return list(self.iter_matches(text))
+
+
+def match_patterns_aho_corasick(patterns, text):
+    """Matches many patterns using the Aho-Corasick algorithm.
+
+    Scanning the text once per pattern costs O(len(patterns) * len(text)).
+    Instead, we build one automaton out of all the patterns and then walk
+    the text once, so the cost is len(text) plus the number of matches
+    (and the total length of all patterns to build the automaton).
+
+    Matches are returned as a sequence of (pattern_id, offset) tuples, where
+    pattern_id is the index of the pattern in patterns. They are ordered by
+    the index at which each match ends."""
+
+    return AhoCorasickAutomaton(patterns).match(text)
@@ -0,0 +1,143 @@
+# /artificialintelligence/approximate_pattern_match.py
+#
+# Pattern match allowing for k mismatches or k edits, using bit vectors
+#
+# See LICENCE.md for Copyright information
+"""Approximate pattern matching methods."""
+
+
+def calculate_character_masks(pattern):
+    """Calculate a bitmask for each character in pattern.
+
+    Bit j of the mask for a character is set if pattern[j] is that
+    character. Characters which are not in the pattern have no mask, which
+    is the same as a mask of 0."""
+
+    masks = {}
+
+    for index, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << index)
+
+    return masks
+
+
+def iter_pattern_k_mismatches(pattern, text, k, masks=None):
+    """Yield (offset, mismatches) for each window with at most k mismatches.
+
+    This is the Shift-And algorithm, extended to count mismatches. We keep
+    k + 1 bit vectors, where bit j of states[d] is set if pattern[0:j + 1]
+    matches the text ending at the current character with at most d
+    mismatches. For each character of the text, a prefix extends with the
+    same number of mismatches if the next pattern character matches, or
+    one more mismatch from states[d - 1] if it doesn't. Python integers
+    are used as the bit vectors, so each step is a handful of integer
+    operations no matter how long the pattern is.
+
+    If masks is given (see calculate_character_masks), it is used instead
+    of being calculated again."""
+
+    if masks is None:
+        masks = calculate_character_masks(pattern)
+
+    pattern_length = len(pattern)
+    match_bit = 1 << (pattern_length - 1)
+
+    states = [0] * (k + 1)
+
+    for text_index, char in enumerate(text):
+        mask = masks.get(char, 0)
+
+        previous = states[0]
+        states[0] = ((previous << 1) | 1) & mask
+
+        for distance in range(1, k + 1):
+            current = states[distance]
+            states[distance] = ((((current << 1) | 1) & mask) |
+                                ((previous << 1) | 1))
+            previous = current
+
+        if states[k] & match_bit:
+            distance = 0
+            while not states[distance] & match_bit:
+                distance += 1
+
+            yield (text_index - pattern_length + 1, distance)
+
+
+def iter_pattern_k_edits(pattern, text, k, masks=None):
+    """Yield (end_offset, edits) for each place pattern ends with <= k edits.
+
+    This is Myers' bit-vector algorithm. Conceptually we fill in the
+    edit distance table between pattern and text column by column, where
+    a match may start anywhere in the text, so the top row is all zeros.
+    Adjacent cells in a column differ by -1, 0 or +1, so a column can be
+    stored as two bit vectors: one with a bit set for each +1 vertical
+    difference and one for each -1. The next column can be calculated from
+    the previous one with a handful of bitwise operations and one
+    addition, and the score (the bottom cell) changes by the horizontal
+    difference at the last row.
+
+    Since insertions and deletions change the length of a match, the
+    offset yielded is that of the last character of the match, rather than
+    the first. If masks is given (see calculate_character_masks), it is
+    used instead of being calculated again."""
+
+    if masks is None:
+        masks = calculate_character_masks(pattern)
+
+    pattern_length = len(pattern)
+    all_bits = (1 << pattern_length) - 1
+    last_bit = 1 << (pattern_length - 1)
+
+    positive_vertical = all_bits
+    negative_vertical = 0
+    score = pattern_length
+
+    for text_index, char in enumerate(text):
+        mask = masks.get(char, 0)
+
+        vertical_diagonal = mask | negative_vertical
+        horizontal_diagonal = (((mask & positive_vertical) +
+                                positive_vertical) ^ positive_vertical) | mask
+
+        positive_horizontal = (negative_vertical |
+                               (~(horizontal_diagonal | positive_vertical) &
+                                all_bits))
+        negative_horizontal = positive_vertical & horizontal_diagonal
+
+        if positive_horizontal & last_bit:
+            score += 1
+        elif negative_horizontal & last_bit:
+            score -= 1
+
+        # Matches may start anywhere, so nothing is shifted into the top
+        # row of the table.
+        positive_horizontal = (positive_horizontal << 1) & all_bits
+        negative_horizontal = (negative_horizontal << 1) & all_bits
+
+        positive_vertical = (negative_horizontal |
+                             (~(vertical_diagonal | positive_horizontal) &
+                              all_bits))
+        negative_vertical = positive_horizontal & vertical_diagonal
+
+        if score <= k:
+            yield (text_index, score)
+
+
+def match_pattern_k_mismatches(pattern, text, k):
+    """Matches patterns allowing for up to k mismatched characters.
+
+    Matches are returned as a sequence of (offset, mismatches) tuples.
+    With k = 0 this finds the same matches as the exact matchers."""
+
+    return list(iter_pattern_k_mismatches(pattern, text, k))
+
+
+def match_pattern_k_edits(pattern, text, k):
+    """Matches patterns allowing for up to k insertions, deletions or changes.
+
+    Matches are returned as a sequence of (end_offset, edits) tuples, where
+    end_offset is the index of the last character of the match and edits
+    is the smallest number of edits for a match ending there."""
+
+    return list(iter_pattern_k_edits(pattern, text, k))
@@ -0,0 +1,170 @@
+# /artificialintelligence/batch_lcs.py
+#
+# Pairwise LCS lengths of many sequences, split across a process pool
+#
+# See LICENCE.md for Copyright information
+"""Batch pairwise longest common subsequence lengths."""
+
+from artificialintelligence.approximate_pattern_match import calculate_character_masks
+from artificialintelligence.lcs import lcs_length_bit_parallel
+
+from collections import Counter
+
+import multiprocessing
+
+# Create a few more blocks than workers, so that a slow block does not
+# leave the other workers idle at the end.
+BLOCKS_PER_WORKER = 4
+
+# The sequences and their histograms, set once in each worker process by
+# _initialize_worker rather than sent along with every block.
+_worker_sequences = None
+_worker_histograms = None
+
+
+def lcs_upper_bound(histogram_a, histogram_b):
+    """Return an upper bound on the LCS length of two sequences.
+
+    Each item can appear in a common subsequence at most as many times as
+    it appears in either sequence, so the LCS is no longer than the sum of
+    the smaller of the two counts of each item. That is never more than
+    the length of the shorter sequence."""
+
+    if len(histogram_b) < len(histogram_a):
+        histogram_a, histogram_b = histogram_b, histogram_a
+
+    return sum(min(count, histogram_b.get(item, 0))
+               for item, count in histogram_a.items())
+
+
+def _row_lengths(sequences, histograms, row, threshold):
+    """Return the LCS lengths of sequences[row] with each later sequence.
+
+    Pairs with an LCS shorter than threshold are None. Most of them are
+    never calculated, since the length of the shorter sequence or
+    lcs_upper_bound already shows that they are too short."""
+
+    sequence = sequences[row]
+    histogram = histograms[row]
+    masks = None
+    lengths = []
+
+    for column in range(row + 1, len(sequences)):
+        other = sequences[column]
+
+        if threshold is not None and (
+                min(len(sequence), len(other)) < threshold or
+                lcs_upper_bound(histogram, histograms[column]) < threshold):
+            lengths.append(None)
+            continue
+
+        # The masks for this row are only calculated once, and only if
+        # some pair actually needs them.
+        if masks is None:
+            masks = calculate_character_masks(sequence)
+
+        length = lcs_length_bit_parallel(sequence, other, masks)
+        lengths.append(length if threshold is None or length >= threshold
+                       else None)
+
+    return lengths
+
+
+def _initialize_worker(sequences, histograms):
+    """Keep the sequences and histograms in this worker process."""
+
+    global _worker_sequences
+    global _worker_histograms
+
+    _worker_sequences = sequences
+    _worker_histograms = histograms
+
+
+def _match_block(arguments):
+    """Return the row lengths for each row in one block of rows."""
+
+    row_start, row_end, threshold = arguments
+    return [_row_lengths(_worker_sequences, _worker_histograms, row, threshold)
+            for row in range(row_start, row_end)]
+
+
+def _row_blocks(sequence_count, blocks):
+    """Yield (row_start, row_end) for each block of rows.
+
+    Row i has sequence_count - i - 1 pairs to its right in the upper
+    triangle, so the early rows have more work. Rows are grouped so that
+    each block has about the same number of pairs, rather than the same
+    number of rows."""
+
+    pairs_per_block = max(sequence_count * (sequence_count - 1) //
+                          (2 * blocks), 1)
+
+    row_start = 0
+    pairs = 0
+
+    for row in range(0, sequence_count):
+        pairs += sequence_count - row - 1
+
+        if pairs >= pairs_per_block:
+            yield (row_start, row + 1)
+            row_start = row + 1
+            pairs = 0
+
+    if row_start < sequence_count:
+        yield (row_start, sequence_count)
+
+
+def lcs_length_matrix(sequences, threshold=None, workers=None):
+    """Return the matrix of LCS lengths between every pair of sequences.
+
+    The value at [i][j] is the length of the longest common subsequence of
+    sequences[i] and sequences[j]. The matrix is symmetric, so only pairs
+    with i < j are calculated, in blocks of rows across a process pool.
+    The diagonal holds the length of each sequence, since that is the
+    length of its LCS with itself.
+
+    If threshold is given, every value in the matrix is either None or at
+    least threshold, including the diagonal, which is None for sequences
+    shorter than threshold. Pairs which cheap upper bounds show cannot
+    reach threshold are skipped without calculating their LCS. By default
+    there is one worker per CPU."""
+
+    sequences = list(sequences)
+    histograms = [Counter(sequence) for sequence in sequences]
+    sequence_count = len(sequences)
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if workers == 1 or sequence_count < 2:
+        rows = [_row_lengths(sequences, histograms, row, threshold)
+                for row in range(0, sequence_count)]
+    else:
+        rows = []
+        blocks = ((row_start, row_end, threshold) for row_start, row_end
+                  in _row_blocks(sequence_count, workers * BLOCKS_PER_WORKER))
+
+        # Pool is only a context manager from Python 3.3, so terminate it
+        # ourselves, which is what leaving the with block would do.
+        pool = multiprocessing.Pool(processes=workers,
+                                    initializer=_initialize_worker,
+                                    initargs=(sequences, histograms))
+
+        try:
+            for block_rows in pool.imap(_match_block, blocks):
+                rows.extend(block_rows)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    matrix = [[None] * sequence_count for _ in range(0, sequence_count)]
+
+    for row, lengths in enumerate(rows):
+        if threshold is None or len(sequences[row]) >= threshold:
+            matrix[row][row] = len(sequences[row])
+
+        for column, length in enumerate(lengths, row + 1):
+            matrix[row][column] = length
+            matrix[column][row] = length
+
+    return matrix
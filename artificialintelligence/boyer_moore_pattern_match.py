@@ -5,8 +5,12 @@
 # See LICENCE.md for Copyright information
 """Knuth pattern matching method."""
 
+import itertools
+
 import sys
 
+from collections import namedtuple
+
 def calculate_bad_character_table(pattern,
                                   available_characters):
     """Calculate bad character lookup table.
@@ -75,7 +79,141 @@ def calculate_good_suffix_table(pattern,
 
     return good_suffix_table
 
-def match_pattern_boyer_moore(pattern, text):
+BoyerMooreTables = namedtuple("BoyerMooreTables",
+                              "last_occurrence good_suffix")
+
+def calculate_last_occurrence_table(pattern):
+    """Calculate the index of the last occurrence of each pattern character.
+
+    This replaces the per-position bad character table. When we mismatch
+    at pattern_index, we jump so that the last occurrence of the bad
+    character lines up with it, or one past pattern_index if the last
+    occurrence is to its right. Characters which are not in the pattern
+    are not in the table, so this only depends on the pattern."""
+
+    last_occurrence = {}
+
+    for index, char in enumerate(pattern):
+        last_occurrence[char] = index
+
+    return last_occurrence
+
+def calculate_border_good_suffix_table(pattern):
+    """Calculate the (strong) good suffix table in linear time.
+
+    The value at index j is how far we can jump forward if we have matched
+    the suffix pattern[j:] and then mismatched at pattern[j - 1]. The value
+    at index 0 is how far we can jump after matching the whole pattern.
+
+    First we find the borders of each suffix (the longest proper prefix of
+    pattern[i:] which is also its suffix), the same way that the prefix
+    table is calculated for KMP, but from the right. Whenever extending a
+    border fails, the suffix we were trying to extend occurs again
+    preceded by a different character, so it is a good place to jump to.
+    Any remaining entries can jump so that the longest border of the whole
+    pattern which fits in the matched suffix lines up with it."""
+
+    pattern_length = len(pattern)
+
+    good_suffix = [0] * (pattern_length + 1)
+    border_position = [0] * (pattern_length + 1)
+
+    # Case 1: the matched suffix occurs somewhere else in the pattern
+    suffix_index = pattern_length
+    border_index = pattern_length + 1
+    border_position[suffix_index] = border_index
+
+    while suffix_index > 0:
+        while (border_index <= pattern_length and
+               pattern[suffix_index - 1] != pattern[border_index - 1]):
+            if good_suffix[border_index] == 0:
+                good_suffix[border_index] = border_index - suffix_index
+
+            border_index = border_position[border_index]
+
+        suffix_index -= 1
+        border_index -= 1
+        border_position[suffix_index] = border_index
+
+    # Case 2: only a part of the matched suffix occurs at the start
+    # of the pattern.
+    border_index = border_position[0]
+    for suffix_index in range(0, pattern_length + 1):
+        if good_suffix[suffix_index] == 0:
+            good_suffix[suffix_index] = border_index
+
+        if suffix_index == border_index:
+            border_index = border_position[border_index]
+
+    return good_suffix
+
+def calculate_boyer_moore_tables(pattern):
+    """Calculate the Boyer-Moore tables for pattern in O(len(pattern)).
+
+    Unlike calculate_bad_character_table and calculate_good_suffix_table,
+    these tables do not depend on the characters in the text, so they can
+    be calculated before the text is seen."""
+
+    return BoyerMooreTables(calculate_last_occurrence_table(pattern),
+                            calculate_border_good_suffix_table(pattern))
+
+def iter_pattern_boyer_moore(pattern,
+                             text,
+                             good_suffix_table=None,
+                             bad_character_table=None):
+    """Yield matches of pattern in text using the Boyer-Moore algorithm.
+
+    If good_suffix_table and bad_character_table are given, they are used
+    instead of being calculated again. Characters which are not in
+    bad_character_table are treated as not occurring in the pattern, so
+    the tables are calculated from the characters in the pattern alone,
+    without reading the whole text before the first match."""
+
+    text_length = len(text)
+    pattern_length = len(pattern)
+
+    if good_suffix_table is None or bad_character_table is None:
+        available_characters = frozenset(pattern)
+
+    if good_suffix_table is None:
+        good_suffix_table = calculate_good_suffix_table(pattern,
+                                                        available_characters)
+
+    if bad_character_table is None:
+        bad_character_table = calculate_bad_character_table(pattern,
+                                                            available_characters)
+
+    match_backwards_from = pattern_length - 1
+    while match_backwards_from < text_length:
+        pattern_index = pattern_length - 1
+        text_index = match_backwards_from
+
+        while (pattern_index >= 0 and
+               pattern[pattern_index] == text[text_index]):
+            pattern_index -= 1
+            text_index -= 1
+
+        # Match case - look up in good suffix index to see how far forward
+        # we should jump so that we reach the same character again in
+        # at the start of the pattern
+        if pattern_index < 0:
+            yield match_backwards_from - (pattern_length - 1)
+
+            jump = good_suffix_table[pattern_length - 1] or pattern_length
+
+        # Mismatch case - look up in bad character table to see how far
+        # we should jump forward (eg, so that we have the same number
+        # of characters until the bad character would match again).
+        #
+        # If there isn't an entry, jump forward past the bad character
+        else:
+            jump = (bad_character_table[pattern_index].get(text[text_index], 0) or
+                    pattern_index + 1)
+
+        match_backwards_from += jump
+
+
+def match_pattern_boyer_moore(pattern, text, limit=None):
     """Matches patterns using the Boyer-Moore algorithm.
 
     The Booyer More Algorithm uses two heuristics to determine where to
@@ -91,61 +229,59 @@ def match_pattern_boyer_moore(pattern, text):
     of the overhead of constructing the heuristics
 
     Characters are compared from P[len(p)] -> P[0].
+
+    If limit is given, stop after finding that many matches.
     """
 
-    matches = []
+    return list(itertools.islice(iter_pattern_boyer_moore(pattern, text),
+                                 limit))
+
+def iter_pattern_boyer_moore_linear(pattern, text, tables=None):
+    """Yield matches of pattern in text using the Boyer-Moore algorithm.
+
+    This uses the tables from calculate_boyer_moore_tables, which are
+    linear in the length of the pattern, so if tables is given the cost
+    of each call is only the scan over text."""
+
+    if tables is None:
+        tables = calculate_boyer_moore_tables(pattern)
+
+    last_occurrence, good_suffix = tables
 
     text_length = len(text)
     pattern_length = len(pattern)
 
-    available_characters = frozenset(text)
+    match_backwards_from = pattern_length - 1
+    while match_backwards_from < text_length:
+        pattern_index = pattern_length - 1
+        text_index = match_backwards_from
 
-    good_suffix_table = calculate_good_suffix_table(pattern,
-                                                    available_characters)
-    bad_character_table = calculate_bad_character_table(pattern,
-                                                        available_characters)        
+        while (pattern_index >= 0 and
+               pattern[pattern_index] == text[text_index]):
+            pattern_index -= 1
+            text_index -= 1
+
+        if pattern_index < 0:
+            yield match_backwards_from - (pattern_length - 1)
+            jump = good_suffix[0]
+        else:
+            # Take whichever of the two heuristics jumps the furthest
+            jump = max(good_suffix[pattern_index + 1],
+                       pattern_index - last_occurrence.get(text[text_index], -1))
 
-    def _increment_backward_match_ptr(match_backwards_from, jump):
         match_backwards_from += jump
-        if match_backwards_from > text_length - 1:
-            match_backwards_from = text_length - 1
 
-        return match_backwards_from
+def match_pattern_boyer_moore_linear(pattern, text, limit=None):
+    """Matches patterns using Boyer-Moore with linear-time preprocessing.
 
-    match_backwards_from = pattern_length - 1
-    while match_backwards_from <= text_length:
-        on_last_character = (match_backwards_from == text_length - 1)
-
-        for backwards_offset_index, pattern_index in enumerate(reversed(range(0, pattern_length))):
-
-            # Mismatch case - look up in bad character table to see how far
-            # we should jump forward (eg, so that we have the same number
-            # of characters until the bad character would match again).
-            #
-            # If there isn't an entry, just jump forward the full amount
-            if pattern[pattern_index] != text[match_backwards_from - backwards_offset_index]:
-                if bad_character_table[pattern_index][text[match_backwards_from - backwards_offset_index]]:
-                    jump = bad_character_table[pattern_index][text[match_backwards_from - backwards_offset_index]]
-                else:
-                    jump = pattern_length
-
-                # Increment by j
-                match_backwards_from = _increment_backward_match_ptr(match_backwards_from, jump)
-                break
-
-            # Match case - look up in good suffix index to see how far forward
-            # we should jump so that we reach the same character again in
-            # at the start of the pattern
-            elif pattern_index == 0:
-                if good_suffix_table[(pattern_length - 1) - pattern_index] > 0:
-                    jump = good_suffix_table[(pattern_length - 1) - pattern_index]
-                else:
-                    jump = pattern_length
-
-                matches.append(match_backwards_from - (pattern_length - 1))
-                match_backwards_from = _increment_backward_match_ptr(match_backwards_from, jump)
-
-        if on_last_character:
-            break
-
-    return matches
+    This is the same algorithm as match_pattern_boyer_moore, but the bad
+    character heuristic uses the last occurrence of each character and the
+    good suffix heuristic is calculated from the borders of each suffix of
+    the pattern. Both take O(len(pattern)) to build, no matter how large
+    the alphabet of the text is.
+
+    If limit is given, stop after finding that many matches."""
+
+    return list(itertools.islice(iter_pattern_boyer_moore_linear(pattern,
+                                                                 text),
+                                 limit))
@@ -0,0 +1,80 @@
+# /artificialintelligence/buffer_pattern_match.py
+#
+# Pattern match directly on bytes-like buffers and memory-mapped files
+#
+# See LICENCE.md for Copyright information
+"""Zero-copy pattern matching over bytes, buffers and mapped files."""
+
+from artificialintelligence.compiled_pattern_match import compile
+
+import mmap
+
+
+def iter_pattern_bytes(pattern, data, algorithm="kmp"):
+    """Yield the offset of each match of pattern in data.
+
+    The data is anything which supports the buffer protocol, such as
+    bytes, bytearray, memoryview or mmap.mmap. It is matched through a
+    memoryview of its bytes, so it is never decoded or copied, and the
+    offsets are byte offsets into data.
+
+    The algorithm is any of the algorithms accepted by compile()."""
+
+    compiled = compile(bytes(pattern), algorithm)
+
+    try:
+        view = memoryview(data)
+    except TypeError:
+        # Python 2 mapped files cannot be viewed, but they can already be
+        # indexed and sliced as bytes without reading the whole file.
+        if not isinstance(data, mmap.mmap):
+            raise
+
+        view = data
+
+    # Python 2 memoryviews cannot be cast, but their items are bytes anyway
+    byte_view = view.cast("B") if hasattr(view, "cast") else view
+
+    try:
+        for offset in compiled.finditer(byte_view):
+            yield offset
+    finally:
+        for released_view in (byte_view, view):
+            if hasattr(released_view, "release"):
+                released_view.release()
+
+
+def match_pattern_bytes(pattern, data, algorithm="kmp"):
+    """Return the offsets of every match of pattern in data.
+
+    See iter_pattern_bytes."""
+
+    return list(iter_pattern_bytes(pattern, data, algorithm))
+
+
+def iter_pattern_file(pattern, path, algorithm="kmp"):
+    """Yield the byte offset of each match of pattern in the file at path.
+
+    The file is memory-mapped rather than read, so pages are only brought
+    into memory by the operating system as the matcher reaches them."""
+
+    with open(path, "rb") as file_object:
+        try:
+            mapped = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped, and have no matches anyway
+            return
+
+        try:
+            for offset in iter_pattern_bytes(pattern, mapped, algorithm):
+                yield offset
+        finally:
+            mapped.close()
+
+
+def match_pattern_file(pattern, path, algorithm="kmp"):
+    """Return the byte offsets of every match of pattern in a file.
+
+    See iter_pattern_file."""
+
+    return list(iter_pattern_file(pattern, path, algorithm))
@@ -0,0 +1,140 @@
+# /artificialintelligence/compiled_pattern_match.py
+#
+# Precompiled patterns which can be matched against many texts
+#
+# See LICENCE.md for Copyright information
+"""Precompiled, reusable pattern objects for all of the matchers."""
+
+from artificialintelligence.approximate_pattern_match import calculate_character_masks
+from artificialintelligence.boyer_moore_pattern_match import (calculate_boyer_moore_tables,
+                                                              iter_pattern_boyer_moore_linear)
+from artificialintelligence.kmp_pattern_match import (calculate_prefix_table,
+                                                      iter_pattern_kmp)
+from artificialintelligence.naive_pattern_match import iter_pattern_naive
+from artificialintelligence.robin_karp_pattern_match import (calculate_double_hash_fingerprint,
+                                                             calculate_rabin_karp_fingerprint,
+                                                             iter_pattern_double_hash_rabin_karp,
+                                                             iter_pattern_generic_rabin_karp)
+from artificialintelligence.shift_and_pattern_match import iter_pattern_shift_and
+from artificialintelligence import vectorized_pattern_match
+
+from collections import namedtuple
+
+import itertools
+
+PatternMatchAlgorithm = namedtuple("PatternMatchAlgorithm",
+                                   "preprocess scan")
+
+
+ALGORITHMS = {
+    "naive": PatternMatchAlgorithm(
+        preprocess=lambda pattern: None,
+        scan=lambda pattern, text, tables: iter_pattern_naive(pattern, text)
+    ),
+    "kmp": PatternMatchAlgorithm(
+        preprocess=calculate_prefix_table,
+        scan=iter_pattern_kmp
+    ),
+    "boyer_moore": PatternMatchAlgorithm(
+        preprocess=calculate_boyer_moore_tables,
+        scan=iter_pattern_boyer_moore_linear
+    ),
+    "rabin_karp": PatternMatchAlgorithm(
+        preprocess=calculate_rabin_karp_fingerprint,
+        scan=iter_pattern_generic_rabin_karp
+    ),
+    "double_hash_rabin_karp": PatternMatchAlgorithm(
+        preprocess=calculate_double_hash_fingerprint,
+        scan=iter_pattern_double_hash_rabin_karp
+    ),
+    "shift_and": PatternMatchAlgorithm(
+        preprocess=calculate_character_masks,
+        scan=iter_pattern_shift_and
+    )
+}
+
+# The vectorized algorithm needs NumPy. If it is not available, use KMP,
+# which finds the same matches.
+if vectorized_pattern_match.numpy is not None:
+    ALGORITHMS["vectorized"] = PatternMatchAlgorithm(
+        preprocess=vectorized_pattern_match.as_character_array,
+        scan=vectorized_pattern_match.iter_pattern_vectorized
+    )
+else:
+    ALGORITHMS["vectorized"] = ALGORITHMS["kmp"]
+
+
+class CompiledPattern(namedtuple("CompiledPattern",
+                                 "pattern algorithm tables")):
+
+    """A pattern with its preprocessing already done for some algorithm.
+
+    Use compile() to create one. The object is immutable, so the same
+    compiled pattern can be matched against any number of texts and only
+    the scan over each text is paid for each time."""
+
+    __slots__ = ()
+
+    def finditer(self, text):
+        """Yield the offset of each match in text."""
+
+        return ALGORITHMS[self.algorithm].scan(self.pattern,
+                                               text,
+                                               self.tables)
+
+    def findall(self, text, limit=None):
+        """Return a list of the offsets of matches in text.
+
+        If limit is given, stop after finding that many matches."""
+
+        return list(itertools.islice(self.finditer(text), limit))
+
+    def search(self, text):
+        """Return the offset of the first match in text, or None.
+
+        This stops scanning text as soon as the first match is found."""
+
+        for offset in self.finditer(text):
+            return offset
+
+        return None
+
+    def exists(self, text):
+        """Return True if there is a match in text.
+
+        This stops scanning text as soon as the first match is found."""
+
+        return self.search(text) is not None
+
+    def count(self, text):
+        """Return the number of matches in text."""
+
+        return sum(1 for _ in self.finditer(text))
+
+
+def compile(pattern, algorithm="kmp"):
+    """Compile pattern for matching with algorithm.
+
+    The algorithm is one of the keys of ALGORITHMS. Its tables (for
+    instance, the prefix table for "kmp") are calculated here, once,
+    rather than on every call to match a text."""
+
+    try:
+        preprocess = ALGORITHMS[algorithm].preprocess
+    except KeyError:
+        raise ValueError("Unknown pattern matching "
+                         "algorithm {0}".format(algorithm))
+
+    return CompiledPattern(pattern, algorithm, preprocess(pattern))
+
+
+def search(pattern, text, algorithm="kmp"):
+    """Return the offset of the first match of pattern in text, or None."""
+
+    return compile(pattern, algorithm).search(text)
+
+
+def exists(pattern, text, algorithm="kmp"):
+    """Return True if pattern occurs in text."""
+
+    return compile(pattern, algorithm).exists(text)
@@ -5,30 +5,16 @@
 # See LICENCE.md for Copyright information
 """Knuth pattern matching method."""
 
-def match_pattern_kmp(pattern, text):
-    """Matches patterns using the KMP algorithm.
+import itertools
 
-    The KMP algorithm mimics a finite-state-automata, jumping back a
-    certain amount when we hit certain characters. This allows us to skip
-    certain parts of the inner loop when we hit a recognizable sub-pattern.
+def calculate_prefix_table(pattern):
+    """Calculate the prefix table for pattern.
 
-    First we construct a prefix function and a table of prefixes for known
-    steps into the pattern. The value of the prefix function is the longest
-    subsequence of the suffix of pattern which is also a prefix of pattern.
+    The value of the prefix table at i is the length of the longest proper
+    suffix of pattern[0:i + 1] which is also a prefix of pattern."""
 
-    The complexity of this algorithm is len(pattern) + len(text).
-    The worse case and best case is O(n)
-
-    Then we use the prefix value as calculated during matches to jump ahead
-    during pattern matching."""
-
-    matches = []
-
-    text_length = len(text)
     pattern_length = len(pattern)
 
-    prefix_table = { 0 :0 }
-
     # The current_jump_index keeps track of the length of the suffix
     # which matches an earlier state. 
     current_jump_index = 0
@@ -52,7 +38,7 @@ def match_pattern_kmp(pattern, text):
         # common suffix for this case.
         while (current_jump_index > 0 and
                pattern[length] != pattern[current_jump_index]):
-            current_jump_index = prefix_table[current_jump_index]
+            current_jump_index = prefix_table[current_jump_index - 1]
 
         if pattern[length] == pattern[current_jump_index]:
             current_jump_index += 1
@@ -72,35 +58,61 @@ def match_pattern_kmp(pattern, text):
                                                                i,
                                                                current_jump_index)
 
+    return prefix_table
+
+
+def iter_pattern_kmp(pattern, text, prefix_table=None):
+    """Yield matches of pattern in text using the KMP algorithm.
+
+    If prefix_table is given (see calculate_prefix_table), it is used
+    instead of being calculated again."""
+
+    if prefix_table is None:
+        prefix_table = calculate_prefix_table(pattern)
+
+    pattern_length = len(pattern)
+
+    # The number of characters of the pattern matched so far, which
+    # is also the state of the automaton.
     pattern_index = 0
-    string_index = 0
 
-    # Attempt to match the length of the pattern
-    while string_index - pattern_index <= text_length - pattern_length:
-        if text[string_index + pattern_index] == pattern[pattern_index]:
+    for string_index, char in enumerate(text):
+        # On a mismatch, assume we've matched only as many characters
+        # as the longest prefix which is also a suffix of what we've
+        # matched so far, as precomputed in the prefix_table.
+        while pattern_index > 0 and char != pattern[pattern_index]:
+            pattern_index = prefix_table[pattern_index - 1]
+
+        if char == pattern[pattern_index]:
             pattern_index += 1
 
-            # Terminating condition - we've matched every character
-            # in the pattern
-            if pattern_index == pattern_length:
-                matches.append(string_index)
-
-                # Due to the prefix/suffix overlap, assume we've matched
-                # n characters as precomputed in the prefix_table.
-                pattern_index = prefix_table[pattern_index - 1]
-
-                # Movement of the string index is by the entire length
-                # of the pattern (since we matched the whole thing), though
-                # like below we roll-back to account for already-matched
-                # characters
-                string_index = string_index + pattern_length - pattern_index
-        else:
-            # Move by the number of chars we've checked so far
-            move = pattern_index + 1
-
-            # Next pattern_index (eg, we assume we've checked this many
-            # characters already at this point due to the overlap)
-            pattern_index = prefix_table[pattern_index]
-            string_index = string_index + move - pattern_index
-
-    return matches
+        # Terminating condition - we've matched every character
+        # in the pattern
+        if pattern_index == pattern_length:
+            yield string_index - pattern_length + 1
+
+            # Due to the prefix/suffix overlap, assume we've matched
+            # n characters as precomputed in the prefix_table.
+            pattern_index = prefix_table[pattern_index - 1]
+
+
+def match_pattern_kmp(pattern, text, limit=None):
+    """Matches patterns using the KMP algorithm.
+
+    The KMP algorithm mimics a finite-state-automata, jumping back a
+    certain amount when we hit certain characters. This allows us to skip
+    certain parts of the inner loop when we hit a recognizable sub-pattern.
+
+    First we construct a prefix function and a table of prefixes for known
+    steps into the pattern. The value of the prefix function is the longest
+    subsequence of the suffix of pattern which is also a prefix of pattern.
+
+    The complexity of this algorithm is len(pattern) + len(text).
+    The worse case and best case is O(n)
+
+    Then we use the prefix value as calculated during matches to jump ahead
+    during pattern matching.
+
+    If limit is given, stop after finding that many matches."""
+
+    return list(itertools.islice(iter_pattern_kmp(pattern, text), limit))
@@ -5,10 +5,38 @@
 # See LICENCE.md for Copyright information
 """Loader module."""
 
-from collections import defaultdict
+from array import array
+
+from collections import defaultdict, namedtuple
+
+from fractions import Fraction
+
+import bisect
+
+import heapq
+
+import itertools
+
+import math
+
+import numbers
 
 import sys
 
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Python 2 arrays have no 64 bit integer typecode
+try:
+    array("q")
+    _HAS_INT64_ARRAYS = True
+except ValueError:
+    _HAS_INT64_ARRAYS = False
+
 def knapsack(items, capacity):
     """0-1 knapsack dynamic programming algorithm."""
 
@@ -100,3 +128,669 @@ def items_for_knapsack(items, capacity):
 
 
     return pick_items(len(items), capacity, retval)
+
+
+def _is_integer(number):
+    """Return True if number is an integer of any type."""
+
+    return isinstance(number, numbers.Integral)
+
+
+def _typecode(numbers):
+    """Return the array typecode which holds sums of numbers exactly.
+
+    Integers fit in "q" as long as the sum of all of them does. A mix of
+    integers and floats fits in "d" as long as every integer has an exact
+    double. Anything else, such as a Decimal or a Fraction, or integers
+    which are too large, can't be held exactly by any typecode, and this
+    returns None (see _number_buffer)."""
+
+    numbers = list(numbers)
+
+    if all(_is_integer(number) for number in numbers):
+        return "q" if sum(abs(number) for number in numbers) < 2 ** 63 else None
+
+    if all(isinstance(number, float) or
+           (_is_integer(number) and abs(number) <= 2 ** 53)
+           for number in numbers):
+        return "d"
+
+    return None
+
+
+def _number_buffer(typecode, numbers=()):
+    """Return an array of numbers, or a list if typecode is None.
+
+    A list keeps Python numbers, so huge integers stay exact. A list is
+    also used for "q" where arrays don't support it."""
+
+    if typecode is None or (typecode == "q" and not _HAS_INT64_ARRAYS):
+        return list(numbers)
+
+    return array(typecode, numbers)
+
+
+def _empty_like(numbers):
+    """Return an empty buffer of the same kind as numbers."""
+
+    if isinstance(numbers, array):
+        return array(numbers.typecode)
+
+    return []
+
+
+def _value_typecode(items):
+    """Return the array typecode to use for sums of item values."""
+
+    return _typecode(item.value for item in items)
+
+
+def _decision_row_bytes(capacity):
+    """Return the number of bytes in each item's row of decision bits.
+
+    Rows are padded to a whole number of bytes, so that a row can be
+    written at once by numpy.packbits. Within each byte, the first bit is
+    the most significant one, which is the order numpy.packbits uses."""
+
+    return (capacity + 8) // 8
+
+
+def _decision_bit(capacity, item_index, current_capacity):
+    """Return the index of the decision bit for an item and capacity."""
+
+    return item_index * _decision_row_bytes(capacity) * 8 + current_capacity
+
+
+def knapsack_bottom_up(items, capacity, record_decisions=False):
+    """0-1 knapsack dynamic programming algorithm, without recursion.
+
+    Only one row of the table is kept, in an array of capacity + 1 values,
+    where the value at c is the best value for a capacity of c using the
+    items seen so far. Each item updates the row from the highest capacity
+    down, so that best[c - cost] still holds the value without this item
+    when it is read, and each item is only ever picked once.
+
+    If record_decisions is True, a bitmap with one bit per item and
+    capacity is also kept, with the bit set if taking the item improved
+    the value at that capacity. That is enough to reconstruct the chosen
+    items (see items_from_decisions) in an eighth of a byte per cell.
+
+    Returns (decisions, value), where decisions is None unless
+    record_decisions is True."""
+
+    best = _number_buffer(_value_typecode(items), [0] * (capacity + 1))
+    decisions = None
+
+    if record_decisions:
+        decisions = bytearray(len(items) * _decision_row_bytes(capacity))
+
+    for item_index, item in enumerate(items):
+        for current_capacity in range(capacity, item.cost - 1, -1):
+            candidate = best[current_capacity - item.cost] + item.value
+
+            if candidate > best[current_capacity]:
+                best[current_capacity] = candidate
+
+                if decisions is not None:
+                    bit = _decision_bit(capacity, item_index, current_capacity)
+                    decisions[bit >> 3] |= 0x80 >> (bit & 7)
+
+    return (decisions, best[capacity])
+
+
+def _indices_from_decisions(sizes, capacity, decisions, start):
+    """Return the indices of the items picked according to decisions.
+
+    Walk back from the last item, starting from start. If its bit is set
+    at what is left, then it is in the knapsack, so the rest of the
+    knapsack is the best one for the earlier items in what is left after
+    taking away its size."""
+
+    picked = []
+    remaining = start
+
+    for item_index in reversed(range(0, len(sizes))):
+        bit = _decision_bit(capacity, item_index, remaining)
+
+        if decisions[bit >> 3] & (0x80 >> (bit & 7)):
+            picked.append(item_index)
+            remaining -= sizes[item_index]
+
+    picked.reverse()
+    return picked
+
+
+def items_from_decisions(items, capacity, decisions):
+    """Returns the values of the items picked according to decisions."""
+
+    return [items[item_index].value for item_index in
+            _indices_from_decisions([item.cost for item in items],
+                                    capacity,
+                                    decisions,
+                                    capacity)]
+
+
+def items_for_knapsack_bottom_up(items, capacity):
+    """Returns the optimal items that make up the knapsack with capacity.
+
+    This is the same as items_for_knapsack, but uses knapsack_bottom_up,
+    so it works for any number of items and takes O(capacity) memory for
+    the values plus the bitmap of decisions."""
+
+    decisions, _ = knapsack_bottom_up(items, capacity, record_decisions=True)
+    return items_from_decisions(items, capacity, decisions)
+
+
+def knapsack_vectorized(items, capacity, record_decisions=False):
+    """0-1 knapsack dynamic programming algorithm, vectorized with NumPy.
+
+    This is knapsack_bottom_up with each item's update done at once over
+    every capacity: the values with the item are the row shifted up by its
+    cost plus its value, and the new row is the larger of that and the
+    old row. Since the shifted row is a copy, it doesn't matter that the
+    row is updated in place.
+
+    decisions (if record_decisions is True) has the same layout as the
+    one from knapsack_bottom_up, so the two give the same items to
+    items_from_decisions. If NumPy is not available, or the values don't
+    fit in a NumPy type, this falls back to knapsack_bottom_up.
+
+    Returns (decisions, value)."""
+
+    typecode = _value_typecode(items)
+
+    if numpy is None or typecode is None:
+        return knapsack_bottom_up(items, capacity, record_decisions)
+
+    dtype = numpy.int64 if typecode == "q" else numpy.float64
+    best = numpy.zeros(capacity + 1, dtype=dtype)
+    decisions = None
+
+    if record_decisions:
+        decisions = numpy.zeros((len(items), _decision_row_bytes(capacity)),
+                                dtype=numpy.uint8)
+        improved = numpy.zeros(capacity + 1, dtype=bool)
+
+    for item_index, item in enumerate(items):
+        if item.cost > capacity:
+            continue
+
+        candidate = best[:capacity + 1 - item.cost] + item.value
+
+        if decisions is None:
+            numpy.maximum(best[item.cost:], candidate, out=best[item.cost:])
+            continue
+
+        improved[:item.cost] = False
+        numpy.greater(candidate, best[item.cost:], out=improved[item.cost:])
+        best[item.cost:][improved[item.cost:]] = candidate[improved[item.cost:]]
+        decisions[item_index] = numpy.packbits(improved)
+
+    if decisions is not None:
+        decisions = decisions.reshape(-1)
+
+    return (decisions, best[capacity].item())
+
+
+def items_for_knapsack_vectorized(items, capacity):
+    """Returns the optimal items that make up the knapsack with capacity.
+
+    This picks the same items as items_for_knapsack_bottom_up, using
+    knapsack_vectorized."""
+
+    decisions, _ = knapsack_vectorized(items, capacity, record_decisions=True)
+    return items_from_decisions(items, capacity, decisions)
+
+
+KnapsackFrontier = namedtuple("KnapsackFrontier", "costs values chosen")
+
+
+def _chosen_item_indices(chosen):
+    """Return the item indices in a chain of chosen items, in order."""
+
+    indices = []
+
+    while chosen is not None:
+        item_index, chosen = chosen
+        indices.append(item_index)
+
+    indices.reverse()
+    return indices
+
+
+def _merge_frontier(frontier, item_index, item, capacity):
+    """Return the frontier after considering item.
+
+    The states with the item are the states without it, moved up by its
+    cost and value, and both lists are sorted by cost. Merge them by cost,
+    keeping a state only if its value is more than every cheaper state's,
+    since otherwise a cheaper state dominates it. Ties on cost are taken
+    by the larger value first, so the other one is dropped."""
+
+    costs, values, chosen = frontier
+    count = len(costs)
+
+    merged = KnapsackFrontier(_empty_like(costs),
+                              _empty_like(values),
+                              [])
+
+    # Only states which leave room for the item can take it. The
+    # subtraction may round when mixing floats and large integers, so
+    # correct the count with exact comparisons.
+    with_count = bisect.bisect_right(costs, capacity - item.cost)
+
+    while with_count > 0 and costs[with_count - 1] + item.cost > capacity:
+        with_count -= 1
+
+    while with_count < count and costs[with_count] + item.cost <= capacity:
+        with_count += 1
+
+    without_index = 0
+    with_index = 0
+
+    while without_index < count or with_index < with_count:
+        take_item = with_index < with_count and (
+            without_index == count or
+            (costs[with_index] + item.cost,
+             -(values[with_index] + item.value)) <
+            (costs[without_index], -values[without_index])
+        )
+
+        if take_item:
+            cost = costs[with_index] + item.cost
+            value = values[with_index] + item.value
+            state_chosen = (item_index, chosen[with_index])
+            with_index += 1
+        else:
+            cost = costs[without_index]
+            value = values[without_index]
+            state_chosen = chosen[without_index]
+            without_index += 1
+
+        if not merged.values or value > merged.values[-1]:
+            merged.costs.append(cost)
+            merged.values.append(value)
+            merged.chosen.append(state_chosen)
+
+    return merged
+
+
+def knapsack_pareto(items, capacity):
+    """0-1 knapsack algorithm over the Pareto frontier of (cost, value).
+
+    Instead of a value for every capacity, keep only the states which are
+    not dominated, that is, where no other state costs at most as much and
+    is worth at least as much. Sorted by cost, the values of those states
+    strictly increase, and each item is considered by merging the frontier
+    with a copy of itself shifted by the item's cost and value.
+
+    Memory and time scale with the number of non-dominated states rather
+    than with capacity, so this works for huge or real-valued costs and
+    capacities. Each state keeps a chain of the items chosen to reach it,
+    which is shared with the state it was made from.
+
+    Costs and values are kept in arrays where they fit, and in lists of
+    Python numbers where they don't (see _typecode), so integers too large
+    for 64 bits stay exact.
+
+    Returns (frontier, value), where frontier is a KnapsackFrontier of
+    costs and values, sorted by cost, and the chains of chosen items."""
+
+    cost_typecode = _typecode([item.cost for item in items] + [capacity])
+    frontier = KnapsackFrontier(_number_buffer(cost_typecode, [0]),
+                                _number_buffer(_value_typecode(items), [0]),
+                                [None])
+
+    for item_index, item in enumerate(items):
+        frontier = _merge_frontier(frontier, item_index, item, capacity)
+
+    return (frontier, frontier.values[-1])
+
+
+def items_for_knapsack_pareto(items, capacity):
+    """Returns the optimal items that make up the knapsack with capacity.
+
+    This uses knapsack_pareto, so costs and capacity don't have to be
+    small integers."""
+
+    frontier, _ = knapsack_pareto(items, capacity)
+    return [items[item_index].value for item_index in
+            _chosen_item_indices(frontier.chosen[-1])]
+
+
+KnapsackIncumbent = namedtuple("KnapsackIncumbent", "chosen value optimal")
+
+
+def _density_key(item):
+    """Return a key which sorts items by decreasing value per unit of cost.
+
+    The density is an exact Fraction, so that items with nearly the same
+    density still sort in the right order. Items which cost nothing come
+    first."""
+
+    if item.cost == 0:
+        return (0, 0)
+
+    return (1, -(Fraction(item.value) / Fraction(item.cost)))
+
+
+def _prefix_sums(numbers):
+    """Return [0, numbers[0], numbers[0] + numbers[1], ...]."""
+
+    sums = [0]
+
+    for number in numbers:
+        sums.append(sums[-1] + number)
+
+    return sums
+
+
+# time.monotonic isn't available before Python 3.3
+_clock = getattr(time, "monotonic", time.time)
+
+
+def knapsack_branch_and_bound(items, capacity, node_limit=None, time_limit=None):
+    """0-1 knapsack branch-and-bound algorithm.
+
+    Items are sorted by value per unit of cost. A node of the search has
+    decided whether to take each of the first level items in that order.
+    The best it could possibly do is to fill the rest of the knapsack
+    greedily and then take the fraction of the next item which fits (the
+    fractional knapsack), and the same greedy fill without the fraction
+    is a real knapsack, which becomes the incumbent if it is better.
+
+    Nodes are explored best bound first from a priority queue, and a node
+    whose bound is no better than the incumbent is dropped. So once the
+    best bound left is no better than the incumbent, it is optimal.
+
+    The bounds are only valid if they are never rounded down, so they are
+    calculated exactly: with integers if every cost, value and the
+    capacity is an integer, and with Fractions otherwise.
+
+    If more than node_limit nodes have been explored, or more than
+    time_limit seconds have passed, the search stops and returns the
+    incumbent, which may not be optimal.
+
+    Returns a KnapsackIncumbent of the sorted indices of the chosen items,
+    their value, and whether it was proven optimal."""
+
+    started = _clock()
+
+    if all(_is_integer(number) for number in
+           [item.cost for item in items] +
+           [item.value for item in items] +
+           [capacity]):
+        exact = int
+    else:
+        exact = Fraction
+
+    order = sorted((item_index for item_index, item in enumerate(items)
+                    if item.value > 0),
+                   key=lambda item_index: _density_key(items[item_index]))
+
+    # prefix_costs[k] is the cost of the first k items in order, so the
+    # greedy fill from level is found with a binary search.
+    prefix_costs = _prefix_sums(exact(items[item_index].cost)
+                                for item_index in order)
+    prefix_values = _prefix_sums(exact(items[item_index].value)
+                                 for item_index in order)
+    exact_capacity = exact(capacity)
+
+    def greedy_fill(level, cost):
+        """Return (end, bound) for the greedy fill from level.
+
+        Items in order[level:end] fit in the room left, and bound is the
+        value they add plus the fraction of the next item which fits. With
+        integers, the fraction is rounded down, since no knapsack can be
+        worth a fraction more."""
+
+        room = exact_capacity - cost
+        end = bisect.bisect_right(prefix_costs,
+                                  prefix_costs[level] + room,
+                                  level) - 1
+        bound = prefix_values[end] - prefix_values[level]
+
+        if end < len(order):
+            next_item = items[order[end]]
+            room_left = room - (prefix_costs[end] - prefix_costs[level])
+
+            if exact is int:
+                bound += room_left * next_item.value // next_item.cost
+            else:
+                bound += (room_left * Fraction(next_item.value) /
+                          Fraction(next_item.cost))
+
+        return end, bound
+
+    # The chosen items, value and greedy fill (level, end) of the best
+    # knapsack found so far.
+    incumbent = {"chosen": None, "value": None, "fill": (0, 0)}
+
+    counter = itertools.count()
+    queue = []
+
+    def push(level, cost, value, chosen):
+        """Queue a node, after checking its greedy fill as an incumbent."""
+
+        end, bound = greedy_fill(level, cost)
+        fill_value = value + prefix_values[end] - prefix_values[level]
+
+        if incumbent["value"] is None or fill_value > incumbent["value"]:
+            incumbent["chosen"] = chosen
+            incumbent["value"] = fill_value
+            incumbent["fill"] = (level, end)
+
+        if value + bound > incumbent["value"] and level < len(order):
+            heapq.heappush(queue, (-(value + bound),
+                                   next(counter),
+                                   level,
+                                   cost,
+                                   value,
+                                   chosen))
+
+    push(0, exact(0), exact(0), None)
+
+    nodes = 0
+    optimal = True
+
+    while queue:
+        negative_bound, _, level, cost, value, chosen = heapq.heappop(queue)
+
+        if -negative_bound <= incumbent["value"]:
+            break
+
+        nodes += 1
+        if ((node_limit is not None and nodes > node_limit) or
+                (time_limit is not None and
+                 _clock() - started > time_limit)):
+            optimal = False
+            break
+
+        item_index = order[level]
+        item = items[item_index]
+
+        if cost + exact(item.cost) <= exact_capacity:
+            push(level + 1,
+                 cost + exact(item.cost),
+                 value + exact(item.value),
+                 (item_index, chosen))
+
+        push(level + 1, cost, value, chosen)
+
+    level, end = incumbent["fill"]
+    chosen = sorted(_chosen_item_indices(incumbent["chosen"]) +
+                    order[level:end])
+
+    return KnapsackIncumbent(chosen,
+                             sum((items[item_index].value
+                                  for item_index in chosen),
+                                 0),
+                             optimal)
+
+
+def items_for_knapsack_branch_and_bound(items,
+                                        capacity,
+                                        node_limit=None,
+                                        time_limit=None):
+    """Returns the optimal items that make up the knapsack with capacity.
+
+    This uses knapsack_branch_and_bound, so if node_limit or time_limit
+    is reached, the items are the best found so far."""
+
+    incumbent = knapsack_branch_and_bound(items,
+                                          capacity,
+                                          node_limit,
+                                          time_limit)
+    return [items[item_index].value for item_index in incumbent.chosen]
+
+
+# At or above this epsilon, the greedy 1/2-approximation is good enough.
+GREEDY_EPSILON = 0.5
+
+
+def _greedy_knapsack(items, capacity):
+    """Return (chosen, value) for the greedy 1/2-approximation.
+
+    Take items in order of value per unit of cost while they fit. Either
+    that or the single most valuable item which fits is worth at least
+    half of the optimal knapsack, since together they are worth more than
+    the fractional knapsack."""
+
+    chosen = []
+    value = 0
+    room = capacity
+
+    for item_index in sorted(range(0, len(items)),
+                             key=lambda item_index: _density_key(items[item_index])):
+        if items[item_index].cost <= room:
+            chosen.append(item_index)
+            value += items[item_index].value
+            room -= items[item_index].cost
+
+    best_single = max(range(0, len(items)),
+                      key=lambda item_index: items[item_index].value)
+
+    if items[best_single].value > value:
+        return ([best_single], items[best_single].value)
+
+    return (sorted(chosen), value)
+
+
+def _cheapest_by_scaled_value(costs, scaled_values, limit, capacity):
+    """Return (cheapest, decisions) for the value-indexed knapsack table.
+
+    cheapest[v] is the least cost of a knapsack with a total scaled value
+    of exactly v, for v up to limit, or more than capacity if there isn't
+    one that fits. Since costs are never negative, capacity + 1 is used
+    for knapsacks which don't exist, rather than infinity, which doesn't
+    add to Decimal or Fraction costs.
+
+    Each item's update is vectorized with NumPy, like knapsack_vectorized,
+    if the costs fit in a NumPy type. decisions has the same layout as the
+    one from knapsack_bottom_up, with limit in place of the capacity."""
+
+    typecode = _typecode(list(costs) + [capacity])
+    too_expensive = capacity + 1
+
+    if (numpy is not None and typecode is not None and
+            2 * too_expensive < 2 ** 63):
+        dtype = numpy.int64 if typecode == "q" else numpy.float64
+        cheapest = numpy.full(limit + 1, too_expensive, dtype=dtype)
+        cheapest[0] = 0
+        decisions = numpy.zeros((len(costs), _decision_row_bytes(limit)),
+                                dtype=numpy.uint8)
+        improved = numpy.zeros(limit + 1, dtype=bool)
+
+        for index, cost in enumerate(costs):
+            scaled_value = scaled_values[index]
+            candidate = cheapest[:limit + 1 - scaled_value] + cost
+
+            improved[:scaled_value] = False
+            numpy.less(candidate, cheapest[scaled_value:],
+                       out=improved[scaled_value:])
+            cheapest[scaled_value:][improved[scaled_value:]] = (
+                candidate[improved[scaled_value:]]
+            )
+            decisions[index] = numpy.packbits(improved)
+
+        return (cheapest, decisions.reshape(-1))
+
+    cheapest = [0] + [too_expensive] * limit
+    decisions = bytearray(len(costs) * _decision_row_bytes(limit))
+
+    for index, cost in enumerate(costs):
+        scaled_value = scaled_values[index]
+
+        for current_value in range(limit, scaled_value - 1, -1):
+            candidate = cheapest[current_value - scaled_value] + cost
+
+            if candidate < cheapest[current_value]:
+                cheapest[current_value] = candidate
+                bit = _decision_bit(limit, index, current_value)
+                decisions[bit >> 3] |= 0x80 >> (bit & 7)
+
+    return (cheapest, decisions)
+
+
+def approximate_knapsack(items, capacity, epsilon):
+    """0-1 knapsack approximation worth at least (1 - epsilon) of optimal.
+
+    First find the greedy approximation, worth G, where G <= OPT <= 2G.
+    Round each value down to a multiple of epsilon * G / n. The rounding
+    loses less than that per item, so less than epsilon * G <= epsilon *
+    OPT over the whole knapsack. No knapsack which fits is worth more
+    than 2G, which is 2n / epsilon after rounding, so a table of the
+    cheapest cost for each total rounded value up to that finds the best
+    rounded knapsack in O(n^2 / epsilon) time, no matter how large the
+    costs or capacity are.
+
+    If epsilon is at least GREEDY_EPSILON, the greedy approximation is
+    good enough on its own, and is returned straight away.
+
+    Returns a KnapsackIncumbent of the sorted indices of the chosen items
+    and their value, which isn't claimed to be optimal."""
+
+    if epsilon <= 0:
+        raise ValueError("epsilon must be positive, not {0}".format(epsilon))
+
+    candidates = [item_index for item_index, item in enumerate(items)
+                  if item.cost <= capacity and item.value > 0]
+
+    if not candidates:
+        return KnapsackIncumbent([], 0, False)
+
+    candidate_items = [items[item_index] for item_index in candidates]
+    greedy_chosen, greedy_value = _greedy_knapsack(candidate_items, capacity)
+
+    if epsilon >= GREEDY_EPSILON:
+        return KnapsackIncumbent([candidates[index] for index in greedy_chosen],
+                                 greedy_value,
+                                 False)
+
+    # Scale with Fractions, so that values of any type are rounded exactly
+    scale = Fraction(epsilon) * Fraction(greedy_value) / len(candidate_items)
+    scaled_values = [int(Fraction(item.value) / scale)
+                     for item in candidate_items]
+    limit = int(2 * Fraction(greedy_value) / scale)
+
+    cheapest, decisions = _cheapest_by_scaled_value(
+        [item.cost for item in candidate_items],
+        scaled_values,
+        limit,
+        capacity
+    )
+
+    best_scaled_value = max(current_value for current_value in
+                            range(0, limit + 1)
+                            if cheapest[current_value] <= capacity)
+
+    chosen = _indices_from_decisions(scaled_values,
+                                     limit,
+                                     decisions,
+                                     best_scaled_value)
+
+    return KnapsackIncumbent([candidates[index] for index in chosen],
+                             sum((candidate_items[index].value
+                                  for index in chosen),
+                                 0),
+                             False)
@@ -5,8 +5,16 @@
 # See LICENCE.md for Copyright information
 """Loader module."""
 
+from artificialintelligence.approximate_pattern_match import calculate_character_masks
+from artificialintelligence.vectorized_pattern_match import as_character_array
+
 from collections import namedtuple
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class LCSTableDirection(object):
 
     def __init__(self):
@@ -22,6 +30,9 @@ class LCSTableDirection(object):
 LCSTableEntry = namedtuple("LCSTableEntry",
                            "sequence_length direction")
 
+LCSAlignment = namedtuple("LCSAlignment",
+                          "indices_a indices_b subsequence")
+
 def lcs_length(seq_a, seq_b):
     """Returns table and length of longest common subsequence.
 
@@ -57,18 +68,224 @@ def lcs_length(seq_a, seq_b):
     return lcs_length_table[len(seq_b)][len(seq_a)], lcs_dir_table
 
 
-def longest_common_subsequence(seq_a, seq_b):
-    """Return the longest common subsequence for seq_a and seq_b."""
+def _lcs_forward_row(seq_a, a_start, a_end, seq_b, b_start, b_end):
+    """Return the last row of the LCS table for the given ranges.
+
+    The value at j is the length of the longest common subsequence of
+    seq_a[a_start:a_end] and seq_b[b_start:b_start + j]. Only two rows are
+    kept at a time."""
+
+    width = b_end - b_start
+    previous_row = [0] * (width + 1)
+    current_row = [0] * (width + 1)
+
+    for i in range(a_start, a_end):
+        for j in range(0, width):
+            if seq_a[i] == seq_b[b_start + j]:
+                current_row[j + 1] = previous_row[j] + 1
+            elif previous_row[j + 1] >= current_row[j]:
+                current_row[j + 1] = previous_row[j + 1]
+            else:
+                current_row[j + 1] = current_row[j]
+
+        previous_row, current_row = current_row, previous_row
+
+    return previous_row
+
+
+def _lcs_backward_row(seq_a, a_start, a_end, seq_b, b_start, b_end):
+    """Return the first row of the LCS table for the reversed ranges.
+
+    The value at j is the length of the longest common subsequence of
+    seq_a[a_start:a_end] and seq_b[b_start + j:b_end]."""
+
+    width = b_end - b_start
+    previous_row = [0] * (width + 1)
+    current_row = [0] * (width + 1)
+
+    for i in reversed(range(a_start, a_end)):
+        for j in reversed(range(0, width)):
+            if seq_a[i] == seq_b[b_start + j]:
+                current_row[j] = previous_row[j + 1] + 1
+            elif previous_row[j] >= current_row[j + 1]:
+                current_row[j] = previous_row[j]
+            else:
+                current_row[j] = current_row[j + 1]
+
+        previous_row, current_row = current_row, previous_row
+
+    return previous_row
+
+
+def _hirschberg(seq_a, a_start, a_end, seq_b, b_start, b_end, pairs,
+                last_split=True):
+    """Append the (index_a, index_b) pairs of an LCS of the ranges to pairs.
+
+    Split seq_a in half. Some longest common subsequence is made of an LCS
+    of the first half of seq_a with seq_b[:j] and an LCS of the second
+    half with seq_b[j:], for the j where the sum of their lengths is
+    largest. We can find that j from one row calculated forwards over the
+    first half and one row calculated backwards over the second half, then
+    solve both halves the same way.
+
+    Where more than one j is largest, _lcs_backtrace would have moved left
+    (dropping items of seq_a) for as long as it could, so the last j is
+    taken to get the same subsequence. If seq_a and seq_b were swapped
+    before calling this, pass last_split=False to take the first j.
+
+    Ranges are passed as indices rather than slices, so the sequences are
+    never copied."""
+
+    if a_start == a_end or b_start == b_end:
+        return
+
+    if a_end - a_start == 1:
+        for j in range(b_start, b_end):
+            if seq_a[a_start] == seq_b[j]:
+                pairs.append((a_start, j))
+                break
+
+        return
+
+    a_middle = (a_start + a_end) // 2
+    forward_row = _lcs_forward_row(seq_a, a_start, a_middle,
+                                   seq_b, b_start, b_end)
+    backward_row = _lcs_backward_row(seq_a, a_middle, a_end,
+                                     seq_b, b_start, b_end)
+
+    splits = range(0, b_end - b_start + 1)
+    if last_split:
+        splits = reversed(splits)
+
+    # max returns the first of the largest values in splits
+    split = max(splits, key=lambda j: forward_row[j] + backward_row[j])
+
+    _hirschberg(seq_a, a_start, a_middle,
+                seq_b, b_start, b_start + split,
+                pairs, last_split)
+    _hirschberg(seq_a, a_middle, a_end,
+                seq_b, b_start + split, b_end,
+                pairs, last_split)
+
+
+def lcs_length_rolling(seq_a, seq_b):
+    """Return the length of the longest common subsequence of seq_a and seq_b.
+
+    This is the same as the length returned by lcs_length, but only two
+    rows of the table are kept, each as long as the shorter sequence, and
+    no direction table is built."""
+
+    if len(seq_b) > len(seq_a):
+        seq_a, seq_b = seq_b, seq_a
+
+    return _lcs_forward_row(seq_a, 0, len(seq_a),
+                            seq_b, 0, len(seq_b))[len(seq_b)]
+
+
+def lcs_length_bit_parallel(seq_a, seq_b, masks=None):
+    """Return the length of the longest common subsequence using bit vectors.
+
+    Think of a row of the LCS table for some prefix of seq_b, where the
+    values along the row (over seq_a) increase by 0 or 1 at each step.
+    We store the row as a bit vector with a zero wherever it increases, so
+    the length of the LCS is the number of zero bits at the end.
+
+    Moving down to the next row for a character of seq_b, each run of ones
+    ending in the lowest position where that character occurs in seq_a
+    (a match) has that bit turned into a zero and the zero above the run
+    carried up into a one, which is exactly what adding the matched bits
+    to the row does. So each row takes a few operations on
+    len(seq_a)-bit integers instead of a loop over seq_a, which cuts
+    the work by the width of a machine word (Allison-Dix, Hyyro).
+
+    If masks is given (see calculate_character_masks), it is used instead
+    of being calculated again from seq_a."""
+
+    if masks is None:
+        masks = calculate_character_masks(seq_a)
+
+    all_bits = (1 << len(seq_a)) - 1
+
+    row = all_bits
+    for char in seq_b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & all_bits
+
+    return len(seq_a) - bin(row).count("1")
+
+
+def _as_integer_array(sequence):
+    """Convert sequence into a one-dimensional NumPy array of item codes.
+
+    Strings and bytes are converted to character codes, anything else
+    (NumPy arrays, array.array, lists of integers) keeps its own type."""
+
+    if isinstance(sequence, (str, bytes, bytearray)):
+        return as_character_array(sequence)
+
+    return numpy.asarray(sequence)
+
+
+def lcs_length_wavefront(seq_a, seq_b):
+    """Return the length of the longest common subsequence with NumPy.
+
+    Every cell on an anti-diagonal of the LCS table (where i + j is the
+    same) depends only on cells of the two anti-diagonals before it, so a
+    whole anti-diagonal can be calculated at once with vectorized
+    comparisons, instead of one cell at a time. Only three anti-diagonals
+    are kept, indexed by position in seq_b.
+
+    This is meant for integer-coded sequences (NumPy arrays, array.array,
+    bytes or lists of small integers); strings are compared by code point.
+    If NumPy is not available, this falls back to lcs_length_rolling,
+    which returns the same length."""
+
+    if numpy is None:
+        return lcs_length_rolling(seq_a, seq_b)
+
+    array_a = _as_integer_array(seq_a)
+    array_b = _as_integer_array(seq_b)
+
+    width = len(array_a)
+    height = len(array_b)
+
+    if width == 0 or height == 0:
+        return 0
+
+    # Cells outside the table (and on its top row and left column) are
+    # zero, so every diagonal starts from a fresh zeroed buffer.
+    before_previous = numpy.zeros(height + 1, dtype=numpy.int64)
+    previous = numpy.zeros(height + 1, dtype=numpy.int64)
+
+    for diagonal in range(2, width + height + 1):
+        rows = numpy.arange(max(1, diagonal - width),
+                            min(height, diagonal - 1) + 1)
+        current = numpy.zeros(height + 1, dtype=numpy.int64)
+
+        matches = array_b[rows - 1] == array_a[diagonal - rows - 1]
+        current[rows] = numpy.where(matches,
+                                    before_previous[rows - 1] + 1,
+                                    numpy.maximum(previous[rows - 1],
+                                                  previous[rows]))
+
+        before_previous, previous = previous, current
+
+    return int(previous[height])
+
+
+def _lcs_backtrace(seq_a, seq_b):
+    """Return the (index_a, index_b) pairs of an LCS, using lcs_length."""
 
     sequence_length, direction_table = lcs_length(seq_a, seq_b)
 
     # Start at the end of the direction table (eg, len(seq_a), len(seq_b)
     # and go backwards in the direction of the arrows. If we take an
     # upper-left arrow, then made a note of the x - 1, y - 1 cell that we're
-    # in as an index into both sequences. Both letters should line up. Prepend
-    # the letter to subsequence)
+    # in as an index into both sequences. Both items should line up. The
+    # pairs are found backwards, so reverse them at the end instead of
+    # prepending to a string each time)
 
-    current_subsequence = ""
+    pairs = []
 
     seq_a_table_index = len(seq_a)
     seq_b_table_index = len(seq_b)
@@ -91,11 +308,10 @@ def longest_common_subsequence(seq_a, seq_b):
         elif (direction_table[seq_b_table_index][seq_a_table_index] ==
                 LCSTableDirection.LeftAndUp):
             # We made a left-and-up jump, so assert that we're on the same
-            # character, note it down and decrement the remaining sequence
+            # item, note it down and decrement the remaining sequence
             # length
             assert seq_a[seq_a_table_index - 1] == seq_b[seq_b_table_index - 1]
-            current_subsequence = (seq_a[seq_a_table_index - 1] +
-                                   current_subsequence)
+            pairs.append((seq_a_table_index - 1, seq_b_table_index - 1))
             seq_a_table_index -= 1
             seq_b_table_index -= 1
             sequence_length -= 1
@@ -104,4 +320,191 @@ def longest_common_subsequence(seq_a, seq_b):
         else:
             raise RuntimeError("Code not reachable - {0} remains".format(sequence_length))
 
-    return current_subsequence
+    pairs.reverse()
+    return pairs
+
+
+def lcs_alignment(seq_a, seq_b, linear_space=False):
+    """Return an LCSAlignment of a longest common subsequence.
+
+    seq_a and seq_b can be any indexable sequences whose items can be
+    compared for equality (strings, lists of tokens, tuples, array.array
+    or NumPy arrays). indices_a and indices_b are the increasing indices
+    of each item of the subsequence in seq_a and seq_b, and subsequence is
+    a list of those items.
+
+    If linear_space is True, use Hirschberg's divide-and-conquer method,
+    which takes O(min(len(seq_a), len(seq_b))) memory instead of two full
+    tables, at the cost of about twice as much time. The subsequence is
+    the same one found with the tables, though where an item appears more
+    than once its indices may differ."""
+
+    if linear_space:
+        swapped = len(seq_b) > len(seq_a)
+        if swapped:
+            seq_a, seq_b = seq_b, seq_a
+
+        pairs = []
+        _hirschberg(seq_a, 0, len(seq_a),
+                    seq_b, 0, len(seq_b),
+                    pairs, last_split=not swapped)
+
+        if swapped:
+            seq_a, seq_b = seq_b, seq_a
+            pairs = [(index_a, index_b) for index_b, index_a in pairs]
+    else:
+        pairs = _lcs_backtrace(seq_a, seq_b)
+
+    return LCSAlignment(indices_a=[index_a for index_a, _ in pairs],
+                        indices_b=[index_b for _, index_b in pairs],
+                        subsequence=[seq_a[index_a] for index_a, _ in pairs])
+
+
+def longest_common_subsequence(seq_a, seq_b, linear_space=False):
+    """Return the longest common subsequence for seq_a and seq_b.
+
+    If seq_a is a string, the subsequence is returned as a string,
+    otherwise it is returned as a list of items. See lcs_alignment for
+    the indices of the subsequence in each sequence and for linear_space."""
+
+    subsequence = lcs_alignment(seq_a, seq_b, linear_space).subsequence
+
+    if isinstance(seq_a, str):
+        return "".join(subsequence)
+
+    return subsequence
+
+class DiffOperation(object):
+
+    def __init__(self):
+        """Initializes this DiffOperation."""
+
+        super(DiffOperation, self).__init__()
+
+    Equal = 1 # Item is in both sequences
+    Delete = 2 # Item is only in the first sequence
+    Insert = 3 # Item is only in the second sequence
+
+DiffEdit = namedtuple("DiffEdit",
+                      "operation index_a index_b item")
+
+
+def _myers_furthest_reaching_paths(seq_a, seq_b):
+    """Return the furthest reaching x on each diagonal after each edit.
+
+    Think of the edit graph, where moving right deletes an item of seq_a,
+    moving down inserts an item of seq_b and moving diagonally (where the
+    items are equal) costs nothing. Diagonal k is where x - y == k. After d
+    edits, the furthest point we can reach on each diagonal k comes from
+    the furthest point on k - 1 or k + 1 after d - 1 edits, plus one
+    edit, plus as many free diagonal moves as possible.
+
+    The result is a list with an entry for each d, mapping k + d to x for
+    each k between -d and d, stopping at the first d which reaches the
+    end of both sequences. Only diagonals between -d and d are kept for
+    each d, so this takes O((len(seq_a) + len(seq_b)) * d) time and the
+    trace takes O(d ** 2) memory."""
+
+    length_a = len(seq_a)
+    length_b = len(seq_b)
+    max_edits = length_a + length_b
+
+    # Indexed by k + offset, with one extra on each side so that k - 1 and
+    # k + 1 are always valid indices.
+    offset = max_edits + 1
+    furthest = [0] * (2 * max_edits + 3)
+    trace = []
+
+    for edits in range(0, max_edits + 1):
+        for diagonal in range(-edits, edits + 1, 2):
+            if (diagonal == -edits or
+                    (diagonal != edits and
+                     furthest[offset + diagonal - 1] <
+                     furthest[offset + diagonal + 1])):
+                x = furthest[offset + diagonal + 1]
+            else:
+                x = furthest[offset + diagonal - 1] + 1
+
+            y = x - diagonal
+            while x < length_a and y < length_b and seq_a[x] == seq_b[y]:
+                x += 1
+                y += 1
+
+            furthest[offset + diagonal] = x
+
+            if x >= length_a and y >= length_b:
+                trace.append(furthest[offset - edits:offset + edits + 1])
+                return trace
+
+        trace.append(furthest[offset - edits:offset + edits + 1])
+
+    return trace
+
+
+def diff(seq_a, seq_b):
+    """Return an edit script which turns seq_a into seq_b.
+
+    This uses Myers' O((N + M)D) algorithm, where D is the number of
+    items inserted or deleted, so sequences which are nearly the same are
+    compared in nearly linear time. The sequences can be anything which
+    can be indexed and whose items can be compared for equality, such as
+    strings, lists of lines or lists of tokens.
+
+    The edit script is a list of DiffEdit, in order. Equal edits have the
+    index of the item in both sequences, Delete edits only have index_a
+    and Insert edits only have index_b. The items which are Equal make up
+    a longest common subsequence of seq_a and seq_b."""
+
+    trace = _myers_furthest_reaching_paths(seq_a, seq_b)
+    script = []
+
+    x = len(seq_a)
+    y = len(seq_b)
+
+    # Walk back through the trace, from the last edit to the first. Each
+    # edit is a run of free diagonal moves, preceded by one move right or
+    # down from the furthest point after the previous edit.
+    for edits in reversed(range(1, len(trace))):
+        previous = trace[edits - 1]
+        diagonal = x - y
+
+        def furthest(k):
+            """Return the furthest x on diagonal k after edits - 1 edits."""
+            return previous[k + edits - 1]
+
+        if (diagonal == -edits or
+                (diagonal != edits and
+                 furthest(diagonal - 1) < furthest(diagonal + 1))):
+            previous_diagonal = diagonal + 1
+        else:
+            previous_diagonal = diagonal - 1
+
+        previous_x = furthest(previous_diagonal)
+        previous_y = previous_x - previous_diagonal
+
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            script.append(DiffEdit(DiffOperation.Equal, x, y, seq_a[x]))
+
+        if previous_diagonal == diagonal + 1:
+            script.append(DiffEdit(DiffOperation.Insert,
+                                   None,
+                                   previous_y,
+                                   seq_b[previous_y]))
+        else:
+            script.append(DiffEdit(DiffOperation.Delete,
+                                   previous_x,
+                                   None,
+                                   seq_a[previous_x]))
+
+        x = previous_x
+        y = previous_y
+
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        script.append(DiffEdit(DiffOperation.Equal, x, y, seq_a[x]))
+
+    script.reverse()
+    return script
@@ -0,0 +1,84 @@
+# /artificialintelligence/parallel_pattern_match.py
+#
+# Pattern match large texts by splitting them across a process pool
+#
+# See LICENCE.md for Copyright information
+"""Parallel sharded pattern matching."""
+
+from artificialintelligence.compiled_pattern_match import compile
+
+import multiprocessing
+
+# Create a few more shards than workers, so that a slow shard does not
+# leave the other workers idle at the end.
+SHARDS_PER_WORKER = 4
+
+
+def _match_shard(arguments):
+    """Return the absolute offsets of matches in one shard."""
+
+    compiled, shard, shard_offset = arguments
+    return [shard_offset + match for match in compiled.finditer(shard)]
+
+
+def _shards(compiled, text, shard_size):
+    """Yield (compiled, shard, shard_offset) for each shard of text.
+
+    Each shard owns shard_size characters, but also carries the next
+    len(pattern) - 1 characters so that matches which start in it but
+    cross into the next shard are found. A match which starts in those
+    extra characters cannot fit in them, so it is only ever found by the
+    shard which owns its first character, and no hits are duplicated at
+    the seams."""
+
+    overlap = len(compiled.pattern) - 1
+
+    for shard_offset in range(0, len(text), shard_size):
+        yield (compiled,
+               text[shard_offset:shard_offset + shard_size + overlap],
+               shard_offset)
+
+
+def match_pattern_parallel(pattern,
+                           text,
+                           algorithm="kmp",
+                           workers=None,
+                           shard_size=None):
+    """Matches patterns by splitting text into shards across processes.
+
+    The pattern is compiled once and sent to each worker along with its
+    shard. By default there is one worker per CPU, and the text is split
+    into SHARDS_PER_WORKER shards per worker.
+
+    Matches are returned as a sequence of indices, in order."""
+
+    compiled = compile(pattern, algorithm)
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if shard_size is None:
+        shard_size = -(-len(text) // (workers * SHARDS_PER_WORKER))
+
+    shard_size = max(shard_size, len(pattern), 1)
+
+    if workers == 1 or shard_size >= len(text):
+        return list(compiled.finditer(text))
+
+    matches = []
+
+    # Pool is only a context manager from Python 3.3, so terminate it
+    # ourselves, which is what leaving the with block would do.
+    pool = multiprocessing.Pool(processes=workers)
+
+    try:
+        for shard_matches in pool.imap(_match_shard,
+                                       _shards(compiled,
+                                               text,
+                                               shard_size)):
+            matches.extend(shard_matches)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return matches
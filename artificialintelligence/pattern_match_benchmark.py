@@ -0,0 +1,396 @@
+# /artificialintelligence/pattern_match_benchmark.py
+#
+# Benchmark all of the pattern matchers over a range of corpora
+#
+# See LICENCE.md for Copyright information
+"""Benchmark suite for the pattern matching algorithms.
+
+Run with python -m artificialintelligence.pattern_match_benchmark to
+write a JSON or CSV report of throughput, preprocessing time and peak
+memory for every matcher over every corpus shape."""
+
+from artificialintelligence.approximate_pattern_match import calculate_character_masks
+from artificialintelligence.boyer_moore_pattern_match import (calculate_bad_character_table,
+                                                              calculate_boyer_moore_tables,
+                                                              calculate_good_suffix_table,
+                                                              match_pattern_boyer_moore,
+                                                              match_pattern_boyer_moore_linear)
+from artificialintelligence.compiled_pattern_match import compile
+from artificialintelligence.kmp_pattern_match import (calculate_prefix_table,
+                                                      match_pattern_kmp)
+from artificialintelligence.naive_pattern_match import match_pattern_naive
+from artificialintelligence.robin_karp_pattern_match import (calculate_double_hash_fingerprint,
+                                                             calculate_rabin_karp_fingerprint,
+                                                             match_pattern_double_hash_rabin_karp,
+                                                             match_pattern_generic_rabin_karp,
+                                                             match_pattern_robin_karp)
+from artificialintelligence.shift_and_pattern_match import match_pattern_shift_and
+from artificialintelligence import vectorized_pattern_match
+
+from collections import namedtuple
+
+import argparse
+
+import csv
+
+import json
+
+import random
+
+import sys
+
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+MATCHERS = {
+    "naive": match_pattern_naive,
+    "kmp": match_pattern_kmp,
+    "boyer_moore": match_pattern_boyer_moore,
+    "boyer_moore_linear": match_pattern_boyer_moore_linear,
+    "robin_karp": match_pattern_robin_karp,
+    "generic_rabin_karp": match_pattern_generic_rabin_karp,
+    "double_hash_rabin_karp": match_pattern_double_hash_rabin_karp,
+    "shift_and": match_pattern_shift_and,
+    "vectorized": vectorized_pattern_match.match_pattern_vectorized
+}
+
+# The preprocessing step of each matcher which has one, as a function
+# of (pattern, text), since the original Boyer-Moore tables depend on
+# the characters in the text.
+PREPROCESSORS = {
+    "kmp": lambda pattern, text: calculate_prefix_table(pattern),
+    "boyer_moore": lambda pattern, text: (
+        calculate_good_suffix_table(pattern, frozenset(text)),
+        calculate_bad_character_table(pattern, frozenset(text))
+    ),
+    "boyer_moore_linear": lambda pattern, text: (
+        calculate_boyer_moore_tables(pattern)
+    ),
+    "generic_rabin_karp": lambda pattern, text: (
+        calculate_rabin_karp_fingerprint(pattern)
+    ),
+    "double_hash_rabin_karp": lambda pattern, text: (
+        calculate_double_hash_fingerprint(pattern)
+    ),
+    "shift_and": lambda pattern, text: calculate_character_masks(pattern)
+}
+
+# The name of each matcher in compiled_pattern_match, for those which
+# can be compiled once so that the scan is timed on its own. The original
+# boyer_moore and robin_karp matchers can only be timed as a whole.
+COMPILED_ALGORITHMS = {
+    "naive": "naive",
+    "kmp": "kmp",
+    "boyer_moore_linear": "boyer_moore",
+    "generic_rabin_karp": "rabin_karp",
+    "double_hash_rabin_karp": "double_hash_rabin_karp",
+    "shift_and": "shift_and",
+    "vectorized": "vectorized"
+}
+
+if vectorized_pattern_match.numpy is not None:
+    PREPROCESSORS["vectorized"] = lambda pattern, text: (
+        vectorized_pattern_match.as_character_array(pattern)
+    )
+
+CORPORA = ("random", "log")
+
+DEFAULT_TEXT_LENGTHS = (10000, 100000)
+DEFAULT_PATTERN_LENGTHS = (4, 16, 64)
+DEFAULT_ALPHABET_SIZES = (4, 26, 256)
+DEFAULT_MATCH_DENSITIES = (0.0, 0.001)
+
+BenchmarkCase = namedtuple("BenchmarkCase",
+                           ("corpus text_length pattern_length "
+                            "alphabet_size match_density"))
+
+BenchmarkResult = namedtuple("BenchmarkResult",
+                             ("algorithm corpus text_length pattern_length "
+                              "alphabet_size match_density matches "
+                              "preprocess_seconds scan_seconds total_seconds "
+                              "throughput_mb_per_second peak_memory_bytes"))
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+LOG_WORDS = ("request", "response", "connection", "timeout", "user",
+             "session", "cache", "miss", "hit", "retry", "worker", "queue",
+             "started", "finished", "failed", "bytes", "latency", "token")
+
+
+def alphabet(alphabet_size):
+    """Return a string of alphabet_size distinct characters.
+
+    Small alphabets are made of lowercase letters, like the tests. Larger
+    ones continue into non-ASCII code points, to exercise matchers whose
+    tables depend on the alphabet."""
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    if alphabet_size <= len(letters):
+        return letters[:alphabet_size]
+
+    return letters + "".join(unichr(0x100 + i)
+                             for i in range(0, alphabet_size - len(letters)))
+
+
+def random_corpus(text_length, alphabet_size, generator):
+    """Return text_length characters uniformly drawn from an alphabet."""
+
+    characters = alphabet(alphabet_size)
+    return "".join(generator.choice(characters)
+                   for _ in range(0, text_length))
+
+
+def log_corpus(text_length, generator):
+    """Return text_length characters of something which looks like a log."""
+
+    lines = []
+    length = 0
+
+    while length < text_length:
+        line = "2015-{0:02d}-{1:02d} {2:02d}:{3:02d}:{4:02d} {5} {6}\n".format(
+            generator.randint(1, 12),
+            generator.randint(1, 28),
+            generator.randint(0, 23),
+            generator.randint(0, 59),
+            generator.randint(0, 59),
+            generator.choice(LOG_LEVELS),
+            " ".join(generator.choice(LOG_WORDS)
+                     for _ in range(0, generator.randint(3, 10)))
+        )
+        lines.append(line)
+        length += len(line)
+
+    return "".join(lines)[:text_length]
+
+
+def make_case_text(case, seed=0):
+    """Return (pattern, text) for case.
+
+    The pattern is drawn from the corpus itself (so it looks like the
+    text), then copies of it are written over the text at random offsets
+    until there is roughly match_density matches per character."""
+
+    generator = random.Random(seed)
+
+    if case.corpus == "log":
+        text = log_corpus(case.text_length, generator)
+    else:
+        text = random_corpus(case.text_length,
+                             case.alphabet_size,
+                             generator)
+
+    if case.corpus == "log":
+        pattern_start = generator.randint(0, max(0, len(text) -
+                                                 case.pattern_length))
+        pattern = text[pattern_start:pattern_start + case.pattern_length]
+    else:
+        pattern = random_corpus(case.pattern_length,
+                                case.alphabet_size,
+                                generator)
+
+    text = list(text)
+    insertions = int(case.text_length * case.match_density)
+    for _ in range(0, insertions):
+        offset = generator.randint(0, max(0, len(text) - len(pattern)))
+        text[offset:offset + len(pattern)] = list(pattern)
+
+    return pattern, "".join(text)
+
+
+def benchmark_cases(text_lengths=DEFAULT_TEXT_LENGTHS,
+                    pattern_lengths=DEFAULT_PATTERN_LENGTHS,
+                    alphabet_sizes=DEFAULT_ALPHABET_SIZES,
+                    match_densities=DEFAULT_MATCH_DENSITIES,
+                    corpora=CORPORA):
+    """Yield a BenchmarkCase for every combination of parameters.
+
+    Log corpora have their own alphabet, so they are only generated once
+    for each text length, pattern length and density."""
+
+    for corpus in corpora:
+        for text_length in text_lengths:
+            for pattern_length in pattern_lengths:
+                for match_density in match_densities:
+                    if corpus == "log":
+                        yield BenchmarkCase(corpus,
+                                            text_length,
+                                            pattern_length,
+                                            None,
+                                            match_density)
+                        continue
+
+                    for alphabet_size in alphabet_sizes:
+                        yield BenchmarkCase(corpus,
+                                            text_length,
+                                            pattern_length,
+                                            alphabet_size,
+                                            match_density)
+
+
+def best_time(function, repeat):
+    """Return the best wall-clock time of repeat calls to function."""
+
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def peak_memory(function):
+    """Return the peak number of bytes allocated while calling function.
+
+    If tracemalloc is not available (before Python 3.4), return None."""
+
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(algorithm, case, pattern, text, repeat=3):
+    """Benchmark algorithm on one case and return a BenchmarkResult.
+
+    total_seconds is the time for the whole match_pattern_* call. If the
+    algorithm can be compiled, scan_seconds is the time to scan the text
+    with the pattern compiled beforehand, and the throughput is worked out
+    from that. Otherwise, both of those are None."""
+
+    match_function = MATCHERS[algorithm]
+    preprocess = PREPROCESSORS.get(algorithm)
+
+    matches = len(match_function(pattern, text))
+
+    if preprocess is not None:
+        preprocess_seconds = best_time(lambda: preprocess(pattern, text),
+                                       repeat)
+    else:
+        preprocess_seconds = None
+
+    total_seconds = best_time(lambda: match_function(pattern, text), repeat)
+
+    if algorithm in COMPILED_ALGORITHMS:
+        compiled = compile(pattern, COMPILED_ALGORITHMS[algorithm])
+        scan_seconds = best_time(lambda: list(compiled.finditer(text)),
+                                 repeat)
+        megabytes = len(text.encode("utf-8")) / 1000000.0
+        throughput_mb_per_second = megabytes / max(scan_seconds, 1e-9)
+    else:
+        scan_seconds = None
+        throughput_mb_per_second = None
+
+    return BenchmarkResult(algorithm=algorithm,
+                           corpus=case.corpus,
+                           text_length=case.text_length,
+                           pattern_length=case.pattern_length,
+                           alphabet_size=case.alphabet_size,
+                           match_density=case.match_density,
+                           matches=matches,
+                           preprocess_seconds=preprocess_seconds,
+                           scan_seconds=scan_seconds,
+                           total_seconds=total_seconds,
+                           throughput_mb_per_second=throughput_mb_per_second,
+                           peak_memory_bytes=peak_memory(
+                               lambda: match_function(pattern, text)
+                           ))
+
+
+def run_benchmarks(cases, algorithms=None, repeat=3, seed=0):
+    """Yield a BenchmarkResult for each algorithm on each case."""
+
+    if algorithms is None:
+        algorithms = sorted(MATCHERS.keys())
+
+    for case in cases:
+        pattern, text = make_case_text(case, seed)
+
+        for algorithm in algorithms:
+            yield run_benchmark(algorithm, case, pattern, text, repeat)
+
+
+def write_report(results, stream, report_format="json"):
+    """Write results to stream as JSON or CSV."""
+
+    rows = [result._asdict() for result in results]
+
+    if report_format == "json":
+        json.dump(rows, stream, indent=2)
+        stream.write("\n")
+    elif report_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=BenchmarkResult._fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        raise ValueError("Unknown report format {0}".format(report_format))
+
+
+def _integer_list(value):
+    """Parse a comma-separated list of integers."""
+
+    return [int(v) for v in value.split(",")]
+
+
+def _float_list(value):
+    """Parse a comma-separated list of floats."""
+
+    return [float(v) for v in value.split(",")]
+
+
+def main(argv=None):
+    """Run the benchmarks and write a report."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format",
+                        choices=("json", "csv"),
+                        default="json")
+    parser.add_argument("--output",
+                        type=argparse.FileType("w"),
+                        default=sys.stdout)
+    parser.add_argument("--algorithms",
+                        type=lambda value: value.split(","),
+                        default=sorted(MATCHERS.keys()))
+    parser.add_argument("--corpora",
+                        type=lambda value: value.split(","),
+                        default=list(CORPORA))
+    parser.add_argument("--text-lengths",
+                        type=_integer_list,
+                        default=list(DEFAULT_TEXT_LENGTHS))
+    parser.add_argument("--pattern-lengths",
+                        type=_integer_list,
+                        default=list(DEFAULT_PATTERN_LENGTHS))
+    parser.add_argument("--alphabet-sizes",
+                        type=_integer_list,
+                        default=list(DEFAULT_ALPHABET_SIZES))
+    parser.add_argument("--match-densities",
+                        type=_float_list,
+                        default=list(DEFAULT_MATCH_DENSITIES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(argv)
+
+    cases = benchmark_cases(arguments.text_lengths,
+                            arguments.pattern_lengths,
+                            arguments.alphabet_sizes,
+                            arguments.match_densities,
+                            arguments.corpora)
+    write_report(run_benchmarks(cases,
+                                arguments.algorithms,
+                                arguments.repeat,
+                                arguments.seed),
+                 arguments.output,
+                 arguments.format)
+
+
+if __name__ == "__main__":
+    main()
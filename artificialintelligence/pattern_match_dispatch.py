@@ -0,0 +1,255 @@
+# /artificialintelligence/pattern_match_dispatch.py
+#
+# Pick the fastest pattern matcher for the shape of the input
+#
+# See LICENCE.md for Copyright information
+"""Auto-selecting find_all dispatcher over the pattern matchers.
+
+The cost of each algorithm is modelled as a fixed setup cost (mostly
+preprocessing) plus a cost per character of text, both of which depend on
+the length of the pattern and the size of the alphabet. Those costs are
+stored for a grid of pattern lengths and alphabet sizes, and the nearest
+grid point is used for a given input. Run this module to measure them on
+this host and save them, so that find_all uses them from then on."""
+
+from artificialintelligence.compiled_pattern_match import compile
+from artificialintelligence.pattern_match_benchmark import (BenchmarkCase,
+                                                            best_time,
+                                                            make_case_text)
+from artificialintelligence import vectorized_pattern_match
+
+import argparse
+
+import json
+
+import math
+
+import os
+
+CANDIDATE_ALGORITHMS = ("naive",
+                        "kmp",
+                        "boyer_moore",
+                        "rabin_karp",
+                        "shift_and")
+
+# Without NumPy, the vectorized algorithm is just KMP, so only consider
+# it if NumPy is available.
+if vectorized_pattern_match.numpy is not None:
+    CANDIDATE_ALGORITHMS += ("vectorized", )
+
+PATTERN_LENGTH_BUCKETS = (2, 8, 32, 128)
+ALPHABET_SIZE_BUCKETS = (2, 4, 26, 256)
+
+# Only this many characters of the text are looked at to estimate the size
+# of its alphabet, so that the estimate doesn't cost as much as a match.
+ALPHABET_SAMPLE_LENGTH = 4096
+
+DEFAULT_COST_MODEL_PATH = os.path.join(os.path.expanduser("~"),
+                                       ".artificialintelligence",
+                                       "pattern_match_costs.json")
+
+
+def _default_costs(algorithm, pattern_length, alphabet_size):
+    """Return rough (setup_seconds, seconds_per_char) for an algorithm.
+
+    These are used until the costs have been measured on this host."""
+
+    shortest = min(pattern_length, alphabet_size)
+
+    if algorithm == "naive":
+        return (1e-6, 1.8e-7 * pattern_length)
+    elif algorithm == "kmp":
+        return (1e-6 * pattern_length, 1.3e-7)
+    elif algorithm == "boyer_moore":
+        return (2e-6 * pattern_length, 2e-8 + 7e-7 / shortest)
+    elif algorithm == "rabin_karp":
+        return (2e-6 * pattern_length, 6e-7)
+    elif algorithm == "shift_and":
+        return (1e-6 * pattern_length, 2.5e-7)
+    elif algorithm == "vectorized":
+        return (2e-5, 3e-9 + 5e-8 * pattern_length / alphabet_size ** 2)
+
+    raise ValueError("No default costs for {0}".format(algorithm))
+
+
+def _bucket_key(pattern_length, alphabet_size):
+    """Return the key for a grid point in the cost tables."""
+
+    return "{0},{1}".format(pattern_length, alphabet_size)
+
+
+def _nearest_bucket(value, buckets):
+    """Return the bucket closest to value on a logarithmic scale."""
+
+    value = max(value, 1)
+    return min(buckets,
+               key=lambda bucket: abs(math.log(value) - math.log(bucket)))
+
+
+class CostModel(object):
+
+    """Predicted costs of each pattern matching algorithm.
+
+    costs maps an algorithm name to a dict which maps a bucket key (see
+    _bucket_key) to a (setup_seconds, seconds_per_char) pair."""
+
+    def __init__(self, costs):
+        """Initialize this CostModel from a table of costs."""
+
+        super(CostModel, self).__init__()
+        self.costs = costs
+
+    def predict(self, algorithm, pattern_length, text_length, alphabet_size):
+        """Predict how many seconds algorithm takes for this input shape."""
+
+        key = _bucket_key(_nearest_bucket(pattern_length,
+                                          PATTERN_LENGTH_BUCKETS),
+                          _nearest_bucket(alphabet_size,
+                                          ALPHABET_SIZE_BUCKETS))
+        setup_seconds, seconds_per_char = self.costs[algorithm][key]
+        return setup_seconds + seconds_per_char * text_length
+
+    def choose(self, pattern_length, text_length, alphabet_size):
+        """Return the algorithm predicted to be fastest for this shape."""
+
+        return min(sorted(self.costs.keys()),
+                   key=lambda algorithm: self.predict(algorithm,
+                                                      pattern_length,
+                                                      text_length,
+                                                      alphabet_size))
+
+    def save(self, path):
+        """Save this CostModel to path as JSON."""
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(path, "w") as cost_model_file:
+            json.dump(self.costs, cost_model_file, indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        """Load a CostModel saved to path."""
+
+        with open(path) as cost_model_file:
+            return cls(json.load(cost_model_file))
+
+
+def default_cost_model():
+    """Return a CostModel with rough costs, for use before calibrating."""
+
+    return CostModel(dict(
+        (algorithm, dict((_bucket_key(pattern_length, alphabet_size),
+                          _default_costs(algorithm,
+                                         pattern_length,
+                                         alphabet_size))
+                         for pattern_length in PATTERN_LENGTH_BUCKETS
+                         for alphabet_size in ALPHABET_SIZE_BUCKETS))
+        for algorithm in CANDIDATE_ALGORITHMS
+    ))
+
+
+def calibrate(path=DEFAULT_COST_MODEL_PATH, text_length=10000, repeat=3):
+    """Measure the costs of each algorithm on this host.
+
+    For each grid point, each algorithm is timed matching an empty text
+    (the setup cost) and a random text of text_length characters, and the
+    difference gives the cost per character. If path is not None, the
+    CostModel is saved there, and find_all will use it from then on."""
+
+    global _cost_model
+
+    costs = {}
+
+    for pattern_length in PATTERN_LENGTH_BUCKETS:
+        for alphabet_size in ALPHABET_SIZE_BUCKETS:
+            pattern, text = make_case_text(BenchmarkCase("random",
+                                                         text_length,
+                                                         pattern_length,
+                                                         alphabet_size,
+                                                         0.001))
+            empty = text[:0]
+            key = _bucket_key(pattern_length, alphabet_size)
+
+            for algorithm in CANDIDATE_ALGORITHMS:
+                setup_seconds = best_time(
+                    lambda: list(compile(pattern, algorithm).finditer(empty)),
+                    repeat
+                )
+                total_seconds = best_time(
+                    lambda: list(compile(pattern, algorithm).finditer(text)),
+                    repeat
+                )
+                seconds_per_char = max(total_seconds - setup_seconds,
+                                       0.0) / len(text)
+                costs.setdefault(algorithm, {})[key] = (setup_seconds,
+                                                        seconds_per_char)
+
+    cost_model = CostModel(costs)
+
+    if path is not None:
+        cost_model.save(path)
+        _cost_model = cost_model
+
+    return cost_model
+
+
+_cost_model = None
+
+
+def get_cost_model(path=DEFAULT_COST_MODEL_PATH):
+    """Return the saved CostModel, or the default one if there isn't one.
+
+    The cost model is only loaded once."""
+
+    global _cost_model
+
+    if _cost_model is None:
+        if os.path.exists(path):
+            _cost_model = CostModel.load(path)
+        else:
+            _cost_model = default_cost_model()
+
+    return _cost_model
+
+
+def choose_algorithm(pattern, text, cost_model=None):
+    """Return the name of the algorithm to use to match pattern in text."""
+
+    if cost_model is None:
+        cost_model = get_cost_model()
+
+    alphabet_size = len(frozenset(pattern) |
+                        frozenset(text[:ALPHABET_SAMPLE_LENGTH]))
+
+    return cost_model.choose(len(pattern), len(text), alphabet_size)
+
+
+def find_all(pattern, text, cost_model=None):
+    """Matches patterns using whichever algorithm is fastest for the input.
+
+    The choice depends on the length of the pattern, the length of the
+    text and the size of its alphabet, according to cost_model (or the
+    cost model saved by calibrate(), or the default one).
+
+    Matches are returned as a sequence of indices."""
+
+    algorithm = choose_algorithm(pattern, text, cost_model)
+    return list(compile(pattern, algorithm).finditer(text))
+
+
+def main(argv=None):
+    """Calibrate the cost model on this host and save it."""
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--output", default=DEFAULT_COST_MODEL_PATH)
+    parser.add_argument("--text-length", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args(argv)
+
+    calibrate(arguments.output, arguments.text_length, arguments.repeat)
+
+
+if __name__ == "__main__":
+    main()
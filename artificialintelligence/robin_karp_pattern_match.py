@@ -5,22 +5,21 @@
 # See LICENCE.md for Copyright information
 """Loader module."""
 
-import math
-
-def match_pattern_robin_karp(pattern, text):
-    """Matches patterns based on the Robin-Karp algorithm.
+import itertools
 
-    First convert all of the text in the pattern to integers and then
-    match the integers against each other. We use horners rule to
-    progress along the text character-by-character.
+import math
 
-    Matches are returned as a sequence of indices."""
+from collections import namedtuple
 
-    matches = []
+def iter_pattern_robin_karp(pattern, text):
+    """Yield matches of pattern in text based on the Robin-Karp algorithm."""
 
     text_length = len(text)
     pattern_length = len(pattern)
 
+    if text_length < pattern_length:
+        return
+
     # First calcuate the integer representation of the pattern
     ascii_a_char_value = ord("a") - 1
 
@@ -40,7 +39,7 @@ def match_pattern_robin_karp(pattern, text):
     for i in range(0, text_length - pattern_length + 1):
 
         if text_chunk_as_integer == pattern_as_integer:
-            matches.append(i)
+            yield i
 
         # Now move the text chunk along, by doing the following:
         #
@@ -51,7 +50,19 @@ def match_pattern_robin_karp(pattern, text):
                 (math.pow(10, pattern_length - 1)) * 10) +
                 ord(text[i + pattern_length]) - ascii_a_char_value)
 
-    return matches
+
+def match_pattern_robin_karp(pattern, text, limit=None):
+    """Matches patterns based on the Robin-Karp algorithm.
+
+    First convert all of the text in the pattern to integers and then
+    match the integers against each other. We use horners rule to
+    progress along the text character-by-character.
+
+    Matches are returned as a sequence of indices. If limit is given, stop
+    after finding that many matches."""
+
+    return list(itertools.islice(iter_pattern_robin_karp(pattern, text),
+                                 limit))
 
 # Generic rabin karp.
 #
@@ -70,42 +81,80 @@ def match_pattern_robin_karp(pattern, text):
 # read the plaintext, you get to skip the inner-loop.
 PRIME_NUMBER = 49157
 
-def match_pattern_generic_rabin_karp(pattern, text):
-    """Matches patterns based on the Robin-Karp algorithm.
-
-    First convert all of the text in the pattern to integers and then
-    match the integers against each other. We use horners rule to
-    progress along the text character-by-character.
+RabinKarpFingerprint = namedtuple("RabinKarpFingerprint",
+                                  "pattern_hash initial_value_hash")
 
-    Best case this is O(n + m).
-    Worst case this is O(nm). [constant hash collissions and have to keep doing
-                               the inner loop till we get to the end]
+ALPHABET_LENGTH = 256
 
-    Matches are returned as a sequence of indices."""
 
-    matches = []
+def _char_value(char):
+    """Get the numeric value for this character.
 
-    def char_value(char):
-        """Get the numeric value for this character."""
+    Indexing bytes gives integers already, so they are used as-is."""
+    try:
         return ord(char)
+    except TypeError:
+        return char
+
+
+def _matches_at(pattern, text, offset):
+    """Check if pattern occurs in text at offset without copying text.
+
+    Strings and bytes can check this with startswith. Otherwise slice the
+    text, which for a memoryview is just another view of the same buffer."""
+
+    try:
+        return text.startswith(pattern, offset)
+    except AttributeError:
+        return text[offset:offset + len(pattern)] == pattern
+
+
+def calculate_rabin_karp_fingerprint(pattern):
+    """Calculate the hash of pattern and the "head" for its length.
+
+    The head is the value that the first character of a window of
+    len(pattern) characters is multiplied by in the hash, so that it
+    can be subtracted again when moving the window along."""
 
-    alphabet_len = 256
     pattern_len = len(pattern)
-    text_len = len(text)
 
     pattern_as_integer = 0
-    text_chunk_as_integer = 0
 
     # XXX: Ask what this is for. I suspect its used to determine the maximum
     #      possible "head" for the hash.
     initial_value_hash = 1
     for i in range(0, pattern_len - 1):
-        initial_value_hash = (initial_value_hash * alphabet_len) % PRIME_NUMBER
+        initial_value_hash = (initial_value_hash * ALPHABET_LENGTH) % PRIME_NUMBER
+
+    for i in range(0, pattern_len):
+        pattern_as_integer = (ALPHABET_LENGTH * pattern_as_integer +
+                              _char_value(pattern[i])) % PRIME_NUMBER
+
+    return RabinKarpFingerprint(pattern_as_integer, initial_value_hash)
+
+
+def iter_pattern_generic_rabin_karp(pattern, text, fingerprint=None):
+    """Yield matches of pattern in text using the Rabin-Karp algorithm.
+
+    If fingerprint is given (see calculate_rabin_karp_fingerprint), it is
+    used instead of being calculated again."""
+
+    if fingerprint is None:
+        fingerprint = calculate_rabin_karp_fingerprint(pattern)
 
-    # Construct initial hashes
+    alphabet_len = ALPHABET_LENGTH
+    char_value = _char_value
+    pattern_len = len(pattern)
+    text_len = len(text)
+
+    if text_len < pattern_len:
+        return
+
+    pattern_as_integer, initial_value_hash = fingerprint
+
+    # Construct initial hash
+    text_chunk_as_integer = 0
     for i in range(0, pattern_len):
-        pattern_as_integer = (alphabet_len * pattern_as_integer +
-                              char_value(pattern[i])) % PRIME_NUMBER
         text_chunk_as_integer = (alphabet_len * text_chunk_as_integer +
                                  char_value(text[i])) % PRIME_NUMBER
 
@@ -117,8 +166,8 @@ def match_pattern_generic_rabin_karp(pattern, text):
         # If there is a match, there may be a false positive, so
         # check the characters themselves for a match, then add a match
         if text_chunk_as_integer == pattern_as_integer:
-            if text[i:i + pattern_len] == pattern:
-                matches.append(i)
+            if _matches_at(pattern, text, i):
+                yield i
 
         # Now move the text chunk along, by doing the following:
         #
@@ -141,4 +190,214 @@ def match_pattern_generic_rabin_karp(pattern, text):
             if text_chunk_as_integer < 0:
                 text_chunk_as_integer += PRIME_NUMBER
 
-    return matches
+
+def match_pattern_generic_rabin_karp(pattern, text, limit=None):
+    """Matches patterns based on the Robin-Karp algorithm.
+
+    First convert all of the text in the pattern to integers and then
+    match the integers against each other. We use horners rule to
+    progress along the text character-by-character.
+
+    Best case this is O(n + m).
+    Worst case this is O(nm). [constant hash collissions and have to keep doing
+                               the inner loop till we get to the end]
+
+    Matches are returned as a sequence of indices. If limit is given, stop
+    after finding that many matches."""
+
+    return list(itertools.islice(iter_pattern_generic_rabin_karp(pattern,
+                                                                 text),
+                                 limit))
+
+# Production rabin karp.
+#
+# A small modulus like PRIME_NUMBER means that roughly one in every
+# PRIME_NUMBER windows has the same hash as the pattern without matching
+# it, and each of those costs a comparison of len(pattern) characters. So
+# we use a Mersenne prime near 2 ** 61 for the first hash and an
+# independent second hash modulo another Mersenne prime with a different
+# base. A window is only compared when both hashes agree. The bases are
+# larger than any unicode code point, so different strings never share a
+# representation before reduction.
+#
+# All of the arithmetic is done on python integers, which never lose
+# precision the way that math.pow does.
+FIRST_MODULUS = (1 << 61) - 1
+FIRST_BASE = 1315423911
+
+SECOND_MODULUS = (1 << 31) - 1
+SECOND_BASE = 1114129
+
+DoubleHashFingerprint = namedtuple("DoubleHashFingerprint",
+                                   ("first_hash second_hash "
+                                    "first_head second_head"))
+
+
+class RabinKarpStatistics(object):
+
+    """Counters for the work done by the double hash Rabin-Karp matcher.
+
+    hash_hits is the number of windows where both hashes matched the
+    pattern, and so had to be verified. spurious_hits is how many of
+    those turned out not to be matches."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+
+        super(RabinKarpStatistics, self).__init__()
+
+        self.hash_hits = 0
+        self.spurious_hits = 0
+
+    def __repr__(self):
+        """Represent these statistics."""
+
+        return "RabinKarpStatistics(hash_hits={0}, spurious_hits={1})".format(
+            self.hash_hits,
+            self.spurious_hits
+        )
+
+
+def calculate_double_hash_fingerprint(pattern):
+    """Calculate both hashes of pattern and the heads for its length."""
+
+    first_hash = 0
+    second_hash = 0
+
+    for char in pattern:
+        value = _char_value(char)
+        first_hash = (first_hash * FIRST_BASE + value) % FIRST_MODULUS
+        second_hash = (second_hash * SECOND_BASE + value) % SECOND_MODULUS
+
+    pattern_len = len(pattern)
+    return DoubleHashFingerprint(first_hash,
+                                 second_hash,
+                                 pow(FIRST_BASE,
+                                     max(pattern_len - 1, 0),
+                                     FIRST_MODULUS),
+                                 pow(SECOND_BASE,
+                                     max(pattern_len - 1, 0),
+                                     SECOND_MODULUS))
+
+
+def _iter_double_hash_windows(text, window_len):
+    """Yield (offset, first_hash, second_hash) for each window of text.
+
+    Each window is window_len items long. The first window is hashed the
+    same way as a pattern (see calculate_double_hash_fingerprint), which
+    also gives the heads for its length, and every later window is rolled
+    from the one before it."""
+
+    text_len = len(text)
+
+    if text_len < window_len:
+        return
+
+    first_hash, second_hash, first_head, second_head = (
+        calculate_double_hash_fingerprint(text[0:window_len])
+    )
+
+    for i in range(0, text_len - window_len + 1):
+        yield i, first_hash, second_hash
+
+        # Subtract the head of the window, shift everything along and
+        # add the new tail. Python's modulo is never negative, so there is
+        # no need to correct the result afterwards.
+        if i < text_len - window_len:
+            head_value = _char_value(text[i])
+            tail_value = _char_value(text[i + window_len])
+            first_hash = ((first_hash - head_value * first_head) *
+                          FIRST_BASE + tail_value) % FIRST_MODULUS
+            second_hash = ((second_hash - head_value * second_head) *
+                           SECOND_BASE + tail_value) % SECOND_MODULUS
+
+
+def iter_pattern_double_hash_rabin_karp(pattern,
+                                        text,
+                                        fingerprint=None,
+                                        statistics=None):
+    """Yield matches of pattern in text using double hashed Rabin-Karp.
+
+    If fingerprint is given (see calculate_double_hash_fingerprint), it
+    is used instead of being calculated again. If statistics is given
+    (see RabinKarpStatistics), its counters are incremented as we go."""
+
+    if fingerprint is None:
+        fingerprint = calculate_double_hash_fingerprint(pattern)
+
+    first_hash = fingerprint.first_hash
+    second_hash = fingerprint.second_hash
+
+    for i, first_chunk_hash, second_chunk_hash in _iter_double_hash_windows(
+            text,
+            len(pattern)):
+        if (first_chunk_hash == first_hash and
+                second_chunk_hash == second_hash):
+            if _matches_at(pattern, text, i):
+                yield i
+            elif statistics is not None:
+                statistics.spurious_hits += 1
+
+            if statistics is not None:
+                statistics.hash_hits += 1
+
+
+def match_pattern_double_hash_rabin_karp(pattern,
+                                         text,
+                                         statistics=None,
+                                         limit=None):
+    """Matches patterns based on the Rabin-Karp algorithm with two hashes.
+
+    This is the same as match_pattern_generic_rabin_karp, but with a much
+    larger modulus and a second, independent hash, so spurious hash hits
+    (and the comparisons needed to rule them out) are very rare.
+
+    Matches are returned as a sequence of indices. If limit is given, stop
+    after finding that many matches."""
+
+    return list(itertools.islice(
+        iter_pattern_double_hash_rabin_karp(pattern,
+                                            text,
+                                            statistics=statistics),
+        limit
+    ))
+
+
+def match_patterns_rabin_karp(patterns, text):
+    """Matches many patterns based on the Rabin-Karp algorithm.
+
+    Patterns are grouped by their length. For each distinct length, we
+    roll one double hash (see match_pattern_double_hash_rabin_karp) over
+    the text and look each window's hash up in a dictionary of the
+    fingerprints of every pattern with that length. So the cost is one
+    pass over text per distinct length, no matter how many patterns there
+    are.
+
+    Matches are returned as a sequence of (pattern_id, offset) tuples, where
+    pattern_id is the index of the pattern in patterns, ordered by offset
+    and then by pattern_id."""
+
+    patterns_by_length = {}
+
+    for pattern_id, pattern in enumerate(patterns):
+        if len(pattern) == 0:
+            raise ValueError("Pattern {0} is empty".format(pattern_id))
+
+        fingerprint = calculate_double_hash_fingerprint(pattern)
+        patterns_for_length = patterns_by_length.setdefault(len(pattern), {})
+        patterns_for_length.setdefault(fingerprint[:2], []).append(pattern_id)
+
+    matches = []
+
+    for pattern_len, patterns_for_hash in patterns_by_length.items():
+        for i, first_chunk_hash, second_chunk_hash in _iter_double_hash_windows(
+                text,
+                pattern_len):
+            candidates = patterns_for_hash.get((first_chunk_hash,
+                                                second_chunk_hash))
+            if candidates is not None:
+                for pattern_id in candidates:
+                    if _matches_at(patterns[pattern_id], text, i):
+                        matches.append((pattern_id, i))
+
+    return sorted(matches, key=lambda match: (match[1], match[0]))
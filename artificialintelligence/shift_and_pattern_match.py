@@ -0,0 +1,48 @@
+# /artificialintelligence/shift_and_pattern_match.py
+#
+# Pattern match using the bit-parallel Shift-And method
+#
+# See LICENCE.md for Copyright information
+"""Shift-And pattern matching method."""
+
+from artificialintelligence.approximate_pattern_match import calculate_character_masks
+
+
+def iter_pattern_shift_and(pattern, text, masks=None):
+    """Yield matches of pattern in text using the Shift-And algorithm.
+
+    If masks is given (see calculate_character_masks), it is used instead
+    of being calculated again."""
+
+    if masks is None:
+        masks = calculate_character_masks(pattern)
+
+    pattern_length = len(pattern)
+    match_bit = 1 << (pattern_length - 1)
+
+    state = 0
+    for text_index, char in enumerate(text):
+        state = ((state << 1) | 1) & masks.get(char, 0)
+
+        if state & match_bit:
+            yield text_index - pattern_length + 1
+
+
+def match_pattern_shift_and(pattern, text):
+    """Matches patterns using the Shift-And algorithm.
+
+    Bit j of the state is set if pattern[0:j + 1] matches the text ending
+    at the current character. Moving to the next character, a prefix can
+    only be extended if the next character matches, so the new state is
+    the old one shifted up by one (with bit 0 set, since any position can
+    start a match) and masked by the positions of that character in the
+    pattern. A match ends wherever the last bit is set.
+
+    This is one shift, one or and one and per character of text, instead
+    of a loop over the pattern. Python integers are used as the bit
+    vectors, so there is no limit on the length of the pattern, but it is
+    fastest when the pattern fits in a machine word (up to 64 characters).
+
+    Matches are returned as a sequence of indices."""
+
+    return list(iter_pattern_shift_and(pattern, text))
@@ -0,0 +1,109 @@
+# /artificialintelligence/streaming_pattern_match.py
+#
+# Pattern match over a stream of chunks, such as a large file
+#
+# See LICENCE.md for Copyright information
+"""Streaming pattern matching over file objects and iterators."""
+
+from artificialintelligence.compiled_pattern_match import compile
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield chunks from source.
+
+    If source has a read() method (eg, it is a file object), it is read
+    chunk_size characters at a time until it is exhausted. Otherwise,
+    source is assumed to be an iterable of chunks already."""
+
+    try:
+        read = source.read
+    except AttributeError:
+        for chunk in source:
+            yield chunk
+
+        return
+
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def _stream_kmp(compiled, chunks):
+    """Yield matches of a compiled KMP pattern over chunks.
+
+    The KMP automaton only needs to know how many characters of the
+    pattern it has matched so far, so we carry that across chunks and
+    never need to look at a previous chunk again."""
+
+    pattern = compiled.pattern
+    prefix_table = compiled.tables
+    pattern_length = len(pattern)
+
+    pattern_index = 0
+    chunk_offset = 0
+
+    for chunk in chunks:
+        for string_index, char in enumerate(chunk):
+            while pattern_index > 0 and char != pattern[pattern_index]:
+                pattern_index = prefix_table[pattern_index - 1]
+
+            if char == pattern[pattern_index]:
+                pattern_index += 1
+
+            if pattern_index == pattern_length:
+                yield chunk_offset + string_index - pattern_length + 1
+                pattern_index = prefix_table[pattern_index - 1]
+
+        chunk_offset += len(chunk)
+
+
+def _stream_with_overlap(compiled, chunks):
+    """Yield matches of a compiled pattern over chunks.
+
+    Algorithms which look at a whole window of the text at once (the
+    rolling hash window for Rabin-Karp, or the backwards comparison for
+    Boyer-Moore) need the last len(pattern) - 1 characters of the previous
+    chunk, since a match may start there. No match can fit entirely inside
+    those characters, so nothing is reported twice."""
+
+    overlap = len(compiled.pattern) - 1
+
+    window_offset = 0
+    tail = None
+
+    for chunk in chunks:
+        window = chunk if tail is None else tail + chunk
+
+        for match in compiled.finditer(window):
+            yield window_offset + match
+
+        tail = window[max(0, len(window) - overlap):]
+        window_offset += len(window) - len(tail)
+
+
+def stream_pattern_matches(pattern,
+                           source,
+                           algorithm="kmp",
+                           chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily yield the offset of each match of pattern in source.
+
+    The source is either a file object (in which case it is read
+    chunk_size characters at a time) or an iterable of chunks. Either way,
+    only one chunk plus len(pattern) - 1 characters of the previous one are
+    kept in memory, and offsets are relative to the start of the whole
+    stream.
+
+    The algorithm is any of the algorithms accepted by compile()."""
+
+    compiled = compile(pattern, algorithm)
+    chunks = iter_chunks(source, chunk_size)
+
+    if algorithm == "kmp":
+        return _stream_kmp(compiled, chunks)
+
+    return _stream_with_overlap(compiled, chunks)
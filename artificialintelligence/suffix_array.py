@@ -0,0 +1,237 @@
+# /artificialintelligence/suffix_array.py
+#
+# Index a static text with a suffix array to answer many pattern queries
+#
+# See LICENCE.md for Copyright information
+"""Suffix array and LCP index for repeated queries on a static text."""
+
+from array import array
+
+import struct
+
+# Header of a saved index: magic, whether the text is bytes, the length of
+# the encoded text and the number of suffixes.
+_HEADER = struct.Struct("<4sBQQ")
+_MAGIC = b"SAIX"
+
+
+def calculate_suffix_array(text):
+    """Calculate the suffix array of text by prefix doubling.
+
+    The suffix array is the list of the starting offsets of every suffix
+    of text, sorted by the suffixes. First, every suffix is ranked by its
+    first character. Then, knowing the rank of every suffix by its first k
+    characters, the rank by its first 2k characters is the pair of ranks
+    of the suffixes at i and i + k. Sorting by those pairs doubles k each
+    round, until every suffix has a distinct rank."""
+
+    text_length = len(text)
+
+    character_ranks = dict((char, rank) for rank, char in
+                           enumerate(sorted(frozenset(text))))
+    rank = [character_ranks[char] for char in text]
+    suffixes = list(range(0, text_length))
+
+    k = 1
+    while True:
+        # Suffixes shorter than k sort before any longer ones with the
+        # same prefix, hence the -1.
+        def sort_key(i):
+            return (rank[i], rank[i + k] if i + k < text_length else -1)
+
+        suffixes.sort(key=sort_key)
+
+        new_rank = [0] * text_length
+        for index in range(1, text_length):
+            new_rank[suffixes[index]] = (new_rank[suffixes[index - 1]] +
+                                         (sort_key(suffixes[index - 1]) !=
+                                          sort_key(suffixes[index])))
+
+        rank = new_rank
+
+        if text_length == 0 or rank[suffixes[-1]] == text_length - 1:
+            break
+
+        k *= 2
+
+    return array("i", suffixes)
+
+
+def calculate_lcp_array(text, suffix_array):
+    """Calculate the longest common prefix array using Kasai's algorithm.
+
+    The value at i is the length of the longest common prefix of the
+    suffixes at suffix_array[i - 1] and suffix_array[i] (and 0 at 0).
+
+    Suffixes are visited in order of their offset in text. If the suffix
+    at i has a common prefix of h characters with the one before it in the
+    suffix array, then the suffix at i + 1 has at least h - 1 characters
+    in common with the one before it, so h only ever goes down by one and
+    the whole array is calculated in linear time."""
+
+    text_length = len(text)
+
+    inverse = [0] * text_length
+    for index, suffix in enumerate(suffix_array):
+        inverse[suffix] = index
+
+    lcp = array("i", [0] * text_length)
+
+    common = 0
+    for suffix in range(0, text_length):
+        index = inverse[suffix]
+
+        if index == 0:
+            common = 0
+            continue
+
+        previous = suffix_array[index - 1]
+        while (suffix + common < text_length and
+               previous + common < text_length and
+               text[suffix + common] == text[previous + common]):
+            common += 1
+
+        lcp[index] = common
+
+        if common > 0:
+            common -= 1
+
+    return lcp
+
+
+class SuffixArrayIndex(object):
+
+    """An index of a static text which answers pattern queries quickly.
+
+    Every occurrence of a pattern is a prefix of some suffix of the text,
+    and all of those suffixes are next to each other in the suffix array.
+    So we can find them with a binary search, comparing the pattern to
+    len(pattern) characters of O(log(len(text))) suffixes.
+
+    The suffix array and LCP array are stored in array("i") buffers, which
+    take four bytes per character of text."""
+
+    def __init__(self, text, suffix_array=None, lcp=None):
+        """Build the index for text, unless the arrays are given."""
+
+        super(SuffixArrayIndex, self).__init__()
+
+        self.text = text
+        self.suffix_array = (suffix_array if suffix_array is not None
+                             else calculate_suffix_array(text))
+        self.lcp = (lcp if lcp is not None
+                    else calculate_lcp_array(text, self.suffix_array))
+
+    def _lower_bound(self, pattern):
+        """Return the first index of a suffix not less than pattern."""
+
+        text = self.text
+        suffix_array = self.suffix_array
+        pattern_length = len(pattern)
+
+        low = 0
+        high = len(suffix_array)
+
+        while low < high:
+            middle = (low + high) // 2
+            suffix = suffix_array[middle]
+
+            if text[suffix:suffix + pattern_length] < pattern:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _upper_bound(self, pattern):
+        """Return the first index of a suffix which starts after pattern."""
+
+        text = self.text
+        suffix_array = self.suffix_array
+        pattern_length = len(pattern)
+
+        low = 0
+        high = len(suffix_array)
+
+        while low < high:
+            middle = (low + high) // 2
+            suffix = suffix_array[middle]
+
+            if text[suffix:suffix + pattern_length] <= pattern:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def count(self, pattern):
+        """Return the number of occurrences of pattern in the text.
+
+        This takes two binary searches, without enumerating the
+        occurrences."""
+
+        return self._upper_bound(pattern) - self._lower_bound(pattern)
+
+    def occurrences(self, pattern):
+        """Return the offsets of each occurrence of pattern, in order.
+
+        After finding the first suffix which starts with pattern, the
+        others follow it in the suffix array for as long as the common
+        prefix with the previous suffix is at least len(pattern)."""
+
+        first = self._lower_bound(pattern)
+        suffix_array = self.suffix_array
+        text_length = len(suffix_array)
+        pattern_length = len(pattern)
+
+        if first == text_length:
+            return []
+
+        suffix = suffix_array[first]
+        if self.text[suffix:suffix + pattern_length] != pattern:
+            return []
+
+        last = first + 1
+        while last < text_length and self.lcp[last] >= pattern_length:
+            last += 1
+
+        return sorted(suffix_array[first:last])
+
+    def save(self, path):
+        """Save this index to path.
+
+        The arrays are written in the byte order of this host."""
+
+        is_bytes = not isinstance(self.text, str)
+        encoded_text = bytes(self.text) if is_bytes else self.text.encode("utf-8")
+
+        with open(path, "wb") as index_file:
+            index_file.write(_HEADER.pack(_MAGIC,
+                                          is_bytes,
+                                          len(encoded_text),
+                                          len(self.suffix_array)))
+            index_file.write(encoded_text)
+            self.suffix_array.tofile(index_file)
+            self.lcp.tofile(index_file)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved to path."""
+
+        with open(path, "rb") as index_file:
+            magic, is_bytes, text_length, suffixes = _HEADER.unpack(
+                index_file.read(_HEADER.size)
+            )
+
+            if magic != _MAGIC:
+                raise ValueError("{0} is not a suffix array index".format(path))
+
+            encoded_text = index_file.read(text_length)
+            text = encoded_text if is_bytes else encoded_text.decode("utf-8")
+
+            suffix_array = array("i")
+            suffix_array.fromfile(index_file, suffixes)
+            lcp = array("i")
+            lcp.fromfile(index_file, suffixes)
+
+        return cls(text, suffix_array, lcp)
@@ -0,0 +1,95 @@
+# /artificialintelligence/vectorized_pattern_match.py
+#
+# Pattern match using vectorized comparisons with NumPy, if available
+#
+# See LICENCE.md for Copyright information
+"""Vectorized pattern matching method."""
+
+from artificialintelligence.kmp_pattern_match import match_pattern_kmp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def as_character_array(sequence):
+    """Convert sequence into a NumPy array of character codes.
+
+    Strings become an array of uint32 code points, and anything which
+    supports the buffer protocol (bytes, bytearray, memoryview, mmap.mmap)
+    becomes a uint8 array which shares memory with it."""
+
+    if isinstance(sequence, str):
+        return numpy.frombuffer(sequence.encode("utf-32-le"),
+                                dtype=numpy.dtype("<u4"))
+
+    try:
+        return numpy.frombuffer(sequence, dtype=numpy.uint8)
+    except TypeError:
+        return numpy.asarray(sequence)
+
+
+def iter_pattern_vectorized(pattern, text, pattern_array=None):
+    """Yield matches of pattern in text using vectorized comparisons.
+
+    Instead of comparing each window of the text to the pattern one at a
+    time, we compare every window at once, one pattern position at a time.
+    First, the candidate windows are those which start with the first
+    character of the pattern and end with its last character. Then, for
+    each of the remaining pattern positions, we keep only the candidates
+    which match at that position too. Usually very few candidates survive
+    the first step, so the remaining steps are cheap.
+
+    If pattern_array is given (see as_character_array), it is used instead
+    of converting pattern again."""
+
+    if pattern_array is None:
+        pattern_array = as_character_array(pattern)
+
+    text_array = as_character_array(text)
+
+    pattern_length = len(pattern_array)
+    text_length = len(text_array)
+
+    if pattern_length == 0:
+        for i in range(0, text_length + 1):
+            yield i
+
+        return
+
+    if pattern_length > text_length:
+        return
+
+    windows = text_length - pattern_length + 1
+    candidate_mask = text_array[:windows] == pattern_array[0]
+
+    if pattern_length > 1:
+        candidate_mask &= (text_array[pattern_length - 1:] ==
+                           pattern_array[pattern_length - 1])
+
+    candidates = numpy.flatnonzero(candidate_mask)
+
+    for pattern_index in range(1, pattern_length - 1):
+        if candidates.size == 0:
+            break
+
+        candidates = candidates[text_array[candidates + pattern_index] ==
+                                pattern_array[pattern_index]]
+
+    for i in candidates.tolist():
+        yield i
+
+
+def match_pattern_vectorized(pattern, text):
+    """Matches patterns using vectorized NumPy comparisons.
+
+    If NumPy is not available, this falls back to match_pattern_kmp, which
+    returns the same matches.
+
+    Matches are returned as a sequence of indices."""
+
+    if numpy is None:
+        return match_pattern_kmp(pattern, text)
+
+    return list(iter_pattern_vectorized(pattern, text))
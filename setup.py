@@ -32,6 +32,7 @@ setup(name="artificial-intelligence",
           "sympy"
       ],
       extras_require={
+          "numpy": ["numpy"],
           "test": ["coverage",
                    "coveralls",
                    "nose",
@@ -0,0 +1,54 @@
+# /tests/approximate_pattern_match_test.py
+#
+# Test cases for artificialintelligence.approximate_pattern_match
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.approximate_pattern_match."""
+
+from artificialintelligence.approximate_pattern_match import (match_pattern_k_edits,
+                                                              match_pattern_k_mismatches)
+from artificialintelligence.naive_pattern_match import match_pattern_naive
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+
+class TestApproximatePatternMatch(TestCase):
+
+    """Test cases for approximate pattern matching."""
+
+    @parameterized.expand([
+        ("abc", "abbabcabba"),
+        ("daef", "dedfadaefdeafdaef"),
+        ("abcab", "abcabcabcab")
+    ])
+    def test_zero_mismatches_is_exact(self, pattern, haystack):
+        """Test that no mismatches finds the same matches as exact matching."""
+
+        self.assertEqual([(o, 0) for o in match_pattern_naive(pattern,
+                                                              haystack)],
+                         match_pattern_k_mismatches(pattern, haystack, 0))
+
+    @parameterized.expand([
+        ("daef", "dedfadaefdeafdaef", 2, [(0, 2), (5, 0), (9, 2), (13, 0)]),
+        ("abc", "xbcaxcabx", 1, [(0, 1), (3, 1), (6, 1)]),
+        ("abc", "xxxx", 2, [])
+    ])
+    def test_find_k_mismatches(self, pattern, haystack, k, expected):
+        """Test finding patterns with up to k mismatches."""
+
+        self.assertEqual(expected,
+                         match_pattern_k_mismatches(pattern, haystack, k))
+
+    @parameterized.expand([
+        ("identifier", "an idntifier here", 1, [(11, 1)]),
+        ("identifier", "an identifiier here", 1, [(13, 1)]),
+        ("abc", "abc", 0, [(2, 0)]),
+        ("abcd", "xxxx", 2, [])
+    ])
+    def test_find_k_edits(self, pattern, haystack, k, expected):
+        """Test finding patterns with up to k edits."""
+
+        self.assertEqual(expected,
+                         match_pattern_k_edits(pattern, haystack, k))
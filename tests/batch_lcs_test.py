@@ -0,0 +1,59 @@
+# /tests/batch_lcs_test.py
+#
+# Test cases for artificialintelligence.batch_lcs
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.batch_lcs."""
+
+from artificialintelligence.batch_lcs import (lcs_length_matrix,
+                                              lcs_upper_bound)
+from artificialintelligence.lcs import lcs_length
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+from collections import Counter
+
+SEQUENCES = ["BDCAB",
+             "ABCB",
+             "thisisatest",
+             "testing123testing",
+             "1234",
+             "1224533324"]
+
+
+class TestLCSLengthMatrix(TestCase):
+
+    """Test cases for lcs_length_matrix."""
+
+    @parameterized.expand([("serial", 1), ("parallel", 2)])
+    def test_matrix_matches_lcs_length(self, _, workers):
+        """Test that each pair has the length found by lcs_length."""
+
+        self.assertEqual([[lcs_length(seq_a, seq_b)[0]
+                           for seq_b in SEQUENCES]
+                          for seq_a in SEQUENCES],
+                         lcs_length_matrix(SEQUENCES, workers=workers))
+
+    @parameterized.expand([("serial", 1), ("parallel", 2)])
+    def test_pairs_below_threshold_skipped(self, _, workers):
+        """Test that pairs which cannot reach the threshold are None."""
+
+        matrix = lcs_length_matrix(["aaaa", "aabb", "bbbb", "ab", "a", "ba"],
+                                   threshold=2,
+                                   workers=workers)
+
+        self.assertEqual([[4, 2, None, None, None, None],
+                          [2, 4, 2, 2, None, None],
+                          [None, 2, 4, None, None, None],
+                          [None, 2, None, 2, None, None],
+                          [None, None, None, None, None, None],
+                          [None, None, None, None, None, 2]],
+                         matrix)
+
+    def test_upper_bound_from_histograms(self):
+        """Test that the upper bound is the sum of the smaller counts."""
+
+        self.assertEqual(3, lcs_upper_bound(Counter("aabbc"),
+                                            Counter("abbdd")))
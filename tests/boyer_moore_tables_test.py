@@ -6,7 +6,9 @@
 """Test cases for usage of polysquarecmakelinter.main()."""
 
 from artificialintelligence.boyer_moore_pattern_match import (calculate_bad_character_table,
-                                                              calculate_good_suffix_table)
+                                                              calculate_border_good_suffix_table,
+                                                              calculate_good_suffix_table,
+                                                              calculate_last_occurrence_table)
 
 from nose_parameterized import parameterized, param
 
@@ -57,6 +59,19 @@ EXPECTED_GOOD_SUFFIX_TABLES = [
     })
 ]
 
+EXPECTED_LAST_OCCURRENCE_TABLES = [
+    param("abcab", {
+        "a": 3,
+        "b": 4,
+        "c": 2
+    })
+]
+
+EXPECTED_BORDER_GOOD_SUFFIX_TABLES = [
+    param("abbabab", [5, 5, 5, 5, 2, 5, 4, 1]),
+    param("nanbbbnan", [6, 6, 6, 6, 6, 6, 6, 8, 2, 1])
+]
+
 class TestBoyerMooreTables(TestCase):
     """Test case for the Boyer-Moore tables."""
 
@@ -75,3 +90,17 @@ class TestBoyerMooreTables(TestCase):
         self.assertEqual(expected,
                          calculate_good_suffix_table(pattern,
                                                      set(pattern)))
+
+    @parameterized.expand(EXPECTED_LAST_OCCURRENCE_TABLES)
+    def test_last_occurrence_tables(self, pattern, expected):
+        """Calculate last occurrence table correctly."""
+
+        self.assertEqual(expected,
+                         calculate_last_occurrence_table(pattern))
+
+    @parameterized.expand(EXPECTED_BORDER_GOOD_SUFFIX_TABLES)
+    def test_border_good_suffix_tables(self, pattern, expected):
+        """Calculate border-based good suffix table correctly."""
+
+        self.assertEqual(expected,
+                         calculate_border_good_suffix_table(pattern))
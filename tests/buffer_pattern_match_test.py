@@ -0,0 +1,61 @@
+# /tests/buffer_pattern_match_test.py
+#
+# Test cases for artificialintelligence.buffer_pattern_match
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.buffer_pattern_match."""
+
+from artificialintelligence.buffer_pattern_match import (match_pattern_bytes,
+                                                         match_pattern_file)
+from artificialintelligence.compiled_pattern_match import ALGORITHMS
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+import os
+
+import tempfile
+
+BUFFER_TYPES = [
+    ("bytes", bytes),
+    ("bytearray", bytearray),
+    ("memoryview", memoryview)
+]
+
+
+class TestBufferPatternMatch(TestCase):
+
+    """Test cases for matching patterns in buffers."""
+
+    @parameterized.expand([(a, b, t) for a in ALGORITHMS
+                           for b, t in BUFFER_TYPES])
+    def test_match_in_buffer(self, algorithm, buffer_name, buffer_type):
+        """Test matching a pattern in each kind of buffer."""
+
+        data = buffer_type(b"dedfadaefdeafdaef")
+
+        self.assertEqual([5, 13],
+                         match_pattern_bytes(b"daef", data, algorithm))
+
+    @parameterized.expand([(a, ) for a in ALGORITHMS])
+    def test_match_in_mapped_file(self, algorithm):
+        """Test matching a pattern in a memory-mapped file."""
+
+        file_descriptor, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+
+        with os.fdopen(file_descriptor, "wb") as file_object:
+            file_object.write(b"abcabcabcab")
+
+        self.assertEqual([0, 3, 6],
+                         match_pattern_file(b"abcab", path, algorithm))
+
+    def test_match_in_empty_file(self):
+        """Test that an empty file has no matches."""
+
+        file_descriptor, path = tempfile.mkstemp()
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, path)
+
+        self.assertEqual([], match_pattern_file(b"abc", path))
@@ -5,8 +5,17 @@
 # See LICENCE.md for Copyright information
 """Test cases for usage of polysquarecmakelinter.main()."""
 
-from artificialintelligence.knapsack import (knapsack,
-                                             items_for_knapsack)
+from artificialintelligence.knapsack import (approximate_knapsack,
+                                             knapsack,
+                                             knapsack_branch_and_bound,
+                                             knapsack_bottom_up,
+                                             knapsack_pareto,
+                                             knapsack_vectorized,
+                                             items_for_knapsack,
+                                             items_for_knapsack_branch_and_bound,
+                                             items_for_knapsack_bottom_up,
+                                             items_for_knapsack_pareto,
+                                             items_for_knapsack_vectorized)
 
 from nose_parameterized import parameterized, param
 
@@ -14,6 +23,12 @@ from testtools import TestCase
 
 from collections import namedtuple
 
+from decimal import Decimal
+
+from fractions import Fraction
+
+import random
+
 Item = namedtuple("Item", "value cost")
 
 class TestKnapsack(TestCase):
@@ -68,3 +83,275 @@ class TestKnapsack(TestCase):
         self.assertEqual(TestKnapsack.expected_value_of_knapsack[capacity],
                          list(reversed(sorted(items_for_knapsack(TestKnapsack.items,
                                                                  capacity)))))
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_bottom_up_has_expected_value_for_capacity(self, capacity):
+        """Test that the bottom-up knapsack has the correct value."""
+
+        self.assertEqual(sum(TestKnapsack.expected_value_of_knapsack[capacity]),
+                         knapsack_bottom_up(TestKnapsack.items, capacity)[1])
+
+    def test_bottom_up_doesnt_use_greedy(self):
+        """Test that the bottom-up knapsack picks the value five items."""
+
+        self.assertEqual([5, 5],
+                         items_for_knapsack_bottom_up(TestKnapsack.unequal_items,
+                                                      10))
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_bottom_up_picks_right_items_for_capacity(self, capacity):
+        """Test that the bottom-up knapsack picks the right items."""
+
+        self.assertEqual(TestKnapsack.expected_value_of_knapsack[capacity],
+                         list(reversed(sorted(
+                             items_for_knapsack_bottom_up(TestKnapsack.items,
+                                                          capacity)
+                         ))))
+
+    def test_bottom_up_handles_many_items(self):
+        """Test more items than the recursion limit allows for knapsack."""
+
+        items = [Item(value=1, cost=1)] * 5000
+
+        self.assertEqual(100, knapsack_bottom_up(items, 100)[1])
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_vectorized_has_expected_value_for_capacity(self, capacity):
+        """Test that the vectorized knapsack has the correct value."""
+
+        self.assertEqual(sum(TestKnapsack.expected_value_of_knapsack[capacity]),
+                         knapsack_vectorized(TestKnapsack.items, capacity)[1])
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_vectorized_picks_same_items_as_bottom_up(self, capacity):
+        """Test that the vectorized knapsack picks the same items."""
+
+        self.assertEqual(items_for_knapsack_bottom_up(TestKnapsack.items,
+                                                      capacity),
+                         items_for_knapsack_vectorized(TestKnapsack.items,
+                                                       capacity))
+
+    def test_vectorized_doesnt_use_greedy(self):
+        """Test that the vectorized knapsack picks the value five items."""
+
+        self.assertEqual([5, 5],
+                         items_for_knapsack_vectorized(TestKnapsack.unequal_items,
+                                                       10))
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_pareto_picks_right_items_for_capacity(self, capacity):
+        """Test that the Pareto frontier knapsack picks the right items."""
+
+        self.assertEqual(TestKnapsack.expected_value_of_knapsack[capacity],
+                         list(reversed(sorted(
+                             items_for_knapsack_pareto(TestKnapsack.items,
+                                                       capacity)
+                         ))))
+
+    def test_pareto_doesnt_use_greedy(self):
+        """Test that the Pareto frontier knapsack picks the value five items."""
+
+        self.assertEqual([5, 5],
+                         items_for_knapsack_pareto(TestKnapsack.unequal_items,
+                                                   10))
+
+    def test_pareto_handles_huge_costs(self):
+        """Test costs far too large for a table indexed by capacity."""
+
+        items = [Item(value=item.value, cost=item.cost * 10 ** 12)
+                 for item in TestKnapsack.items]
+
+        self.assertEqual(8, knapsack_pareto(items, 11 * 10 ** 12)[1])
+
+    def test_pareto_handles_costs_beyond_64_bits(self):
+        """Test costs and values too large for a 64 bit integer."""
+
+        items = [Item(value=3 * 10 ** 19, cost=2 * 10 ** 19),
+                 Item(value=4 * 10 ** 19, cost=3 * 10 ** 19),
+                 Item(value=5 * 10 ** 19, cost=4 * 10 ** 19)]
+
+        self.assertEqual([3 * 10 ** 19, 4 * 10 ** 19],
+                         items_for_knapsack_pareto(items, 5 * 10 ** 19))
+
+    def test_pareto_keeps_large_costs_exact_with_real_capacity(self):
+        """Test that a real capacity doesn't round large integer costs."""
+
+        items = [Item(value=2, cost=2 ** 60 + 1), Item(value=1, cost=2 ** 60)]
+
+        self.assertEqual(1, knapsack_pareto(items, float(2 ** 60))[1])
+
+    def test_pareto_handles_real_costs(self):
+        """Test costs and a capacity which are not integers."""
+
+        items = [Item(value=3, cost=1.5),
+                 Item(value=4, cost=2.25),
+                 Item(value=5, cost=3.5)]
+
+        self.assertEqual([3, 4], items_for_knapsack_pareto(items, 3.75))
+
+    def test_pareto_handles_decimal_costs(self):
+        """Test Decimal costs and values, such as amounts in cents."""
+
+        items = [Item(value=Decimal("3.10"), cost=Decimal("1.25")),
+                 Item(value=Decimal("4.05"), cost=Decimal("2.50")),
+                 Item(value=Decimal("5.00"), cost=Decimal("3.75"))]
+
+        self.assertEqual(Decimal("7.15"),
+                         knapsack_pareto(items, Decimal("3.75"))[1])
+
+    def test_pareto_keeps_fractions_exact(self):
+        """Test that Fraction values aren't rounded to floats."""
+
+        items = [Item(value=Fraction(1, 3), cost=Fraction(1, 7)),
+                 Item(value=Fraction(2, 3), cost=1)]
+        value = knapsack_pareto(items, Fraction(8, 7))[1]
+
+        self.assertEqual((Fraction, Fraction(1)), (type(value), value))
+
+    def test_bottom_up_handles_decimal_values(self):
+        """Test Decimal values with integer costs."""
+
+        items = [Item(value=Decimal("1.10"), cost=1),
+                 Item(value=Decimal("2.20"), cost=2)]
+
+        self.assertEqual(Decimal("3.30"), knapsack_bottom_up(items, 3)[1])
+
+    def test_pareto_frontier_is_non_dominated(self):
+        """Test that the frontier only has non-dominated states."""
+
+        frontier, _ = knapsack_pareto(TestKnapsack.items, 10)
+
+        self.assertEqual(([0, 2, 3, 4, 6, 7, 9],
+                          [0, 1, 2, 4, 5, 6, 7]),
+                         (list(frontier.costs), list(frontier.values)))
+
+    @parameterized.expand([param (i) for i in range(0, 11)])
+    def test_branch_and_bound_picks_right_items(self, capacity):
+        """Test that branch-and-bound picks the right items."""
+
+        self.assertEqual(TestKnapsack.expected_value_of_knapsack[capacity],
+                         list(reversed(sorted(
+                             items_for_knapsack_branch_and_bound(
+                                 TestKnapsack.items,
+                                 capacity
+                             )
+                         ))))
+
+    def test_branch_and_bound_doesnt_use_greedy(self):
+        """Test that branch-and-bound picks the value five items."""
+
+        self.assertEqual([0, 1],
+                         knapsack_branch_and_bound(TestKnapsack.unequal_items,
+                                                   10).chosen)
+
+    def test_branch_and_bound_proves_optimal(self):
+        """Test that branch-and-bound says its answer is optimal."""
+
+        incumbent = knapsack_branch_and_bound(TestKnapsack.items, 10)
+
+        self.assertEqual((7, True), (incumbent.value, incumbent.optimal))
+
+    def test_branch_and_bound_exact_for_large_integers(self):
+        """Test that the bounds aren't rounded for integers beyond doubles."""
+
+        items = [Item(value=500000000000000000, cost=200000000000000002),
+                 Item(value=500000000000000002, cost=200000000000000002)]
+        incumbent = knapsack_branch_and_bound(items, 200000000000000003)
+
+        self.assertEqual(([1], 500000000000000002, True),
+                         (incumbent.chosen,
+                          incumbent.value,
+                          incumbent.optimal))
+
+    def test_branch_and_bound_agrees_with_pareto_near_2_60(self):
+        """Test nearly identical items with integers around 2 ** 60.
+
+        Their densities are too close together to tell apart as doubles,
+        so this checks that they are sorted and bounded exactly."""
+
+        generator = random.Random(0)
+
+        for _ in range(0, 300):
+            value = generator.randint(2 ** 55, 2 ** 60)
+            cost = generator.randint(2 ** 55, 2 ** 60)
+            items = [Item(value=value + generator.randint(0, 3),
+                          cost=cost + generator.randint(0, 3))
+                     for _ in range(0, generator.randint(2, 6))]
+            capacity = cost * generator.randint(1, 4) + generator.randint(0, 5)
+
+            self.assertEqual(knapsack_pareto(items, capacity)[1],
+                             knapsack_branch_and_bound(items, capacity).value)
+
+    def test_branch_and_bound_returns_incumbent_at_node_limit(self):
+        """Test that a node limit returns a feasible incumbent."""
+
+        items = [Item(value=7, cost=6)] + TestKnapsack.unequal_items[:2]
+        incumbent = knapsack_branch_and_bound(items, 10, node_limit=0)
+
+        self.assertEqual(([0], 7, False),
+                         (incumbent.chosen,
+                          incumbent.value,
+                          incumbent.optimal))
+
+    @parameterized.expand([param (i, epsilon)
+                           for i in range(0, 11)
+                           for epsilon in (0.1, 0.5, 0.9)])
+    def test_approximate_within_epsilon(self, capacity, epsilon):
+        """Test that the approximation is worth (1 - epsilon) of optimal."""
+
+        optimal = sum(TestKnapsack.expected_value_of_knapsack[capacity])
+        approximation = approximate_knapsack(TestKnapsack.items,
+                                             capacity,
+                                             epsilon)
+
+        self.assertTrue(approximation.value >= (1 - epsilon) * optimal)
+        self.assertTrue(sum(TestKnapsack.items[item_index].cost
+                            for item_index in approximation.chosen) <=
+                        capacity)
+
+    def test_approximate_small_epsilon_finds_optimal(self):
+        """Test that a small epsilon doesn't round away the optimal pick."""
+
+        self.assertEqual([0, 1],
+                         approximate_knapsack(TestKnapsack.unequal_items,
+                                              10,
+                                              0.01).chosen)
+
+    def test_approximate_greedy_takes_best_single_item(self):
+        """Test that the greedy approximation can take the single best item."""
+
+        items = [Item(value=2, cost=1), Item(value=100, cost=100)]
+
+        self.assertEqual([1], approximate_knapsack(items, 100, 0.9).chosen)
+
+    def test_approximate_handles_decimal_values(self):
+        """Test Decimal values and costs, such as amounts in cents."""
+
+        items = [Item(value=Decimal("1.10"), cost=Decimal("2.5")),
+                 Item(value=Decimal("0.40"), cost=1)]
+
+        self.assertEqual(Decimal("1.50"),
+                         approximate_knapsack(items,
+                                              Decimal("3.5"),
+                                              0.1).value)
+
+    def test_approximate_within_epsilon_for_many_items(self):
+        """Test a knapsack of many items against the exact answer."""
+
+        generator = random.Random(0)
+        items = [Item(value=generator.randint(1, 10 ** 6),
+                      cost=generator.randint(1, 10 ** 9))
+                 for _ in range(0, 200)]
+        optimal = knapsack_branch_and_bound(items, 2 * 10 ** 10).value
+
+        self.assertTrue(approximate_knapsack(items, 2 * 10 ** 10, 0.1).value >=
+                        0.9 * optimal)
+
+    def test_approximate_rejects_non_positive_epsilon(self):
+        """Test that epsilon must be positive."""
+
+        self.assertRaises(ValueError,
+                          approximate_knapsack,
+                          TestKnapsack.items,
+                          10,
+                          0)
@@ -5,15 +5,27 @@
 # See LICENCE.md for Copyright information
 """Test cases for usage of artificialintelligence.lcs."""
 
-from artificialintelligence.lcs import (lcs_length,
+from artificialintelligence.lcs import (DiffEdit,
+                                        DiffOperation,
+                                        LCSAlignment,
+                                        diff,
+                                        lcs_alignment,
+                                        lcs_length,
+                                        lcs_length_bit_parallel,
+                                        lcs_length_rolling,
+                                        lcs_length_wavefront,
                                         longest_common_subsequence)
 
 from nose_parameterized import parameterized
 
 from testtools import TestCase
 
+from array import array
+
 from collections import namedtuple
 
+import random
+
 LongestCommonSubsequenceData = namedtuple("LongestCommonSubsequenceData",
                                           "seq_a seq_b expected_lcs")
 
@@ -46,3 +58,131 @@ class TestLongestCommonSubsequence(TestCase):
         """Test that we find the expected longest common subsequence."""
 
         self.assertEqual(expected_lcs, longest_common_subsequence(seq_a, seq_b))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_find_expected_lcs_length_rolling(self, seq_a, seq_b, expected_lcs):
+        """Test that we find the expected length with two rolling rows."""
+
+        self.assertEqual(len(expected_lcs), lcs_length_rolling(seq_a, seq_b))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_find_expected_lcs_linear_space(self, seq_a, seq_b, expected_lcs):
+        """Test that we find the expected subsequence in linear space."""
+
+        self.assertEqual(expected_lcs,
+                         longest_common_subsequence(seq_a,
+                                                    seq_b,
+                                                    linear_space=True))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_find_expected_lcs_length_bit_parallel(self,
+                                                   seq_a,
+                                                   seq_b,
+                                                   expected_lcs):
+        """Test that we find the expected length with bit vectors."""
+
+        self.assertEqual(len(expected_lcs),
+                         lcs_length_bit_parallel(seq_a, seq_b))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_find_expected_lcs_length_wavefront(self,
+                                                seq_a,
+                                                seq_b,
+                                                expected_lcs):
+        """Test that we find the expected length one anti-diagonal at a time."""
+
+        self.assertEqual(len(expected_lcs),
+                         lcs_length_wavefront(seq_a, seq_b))
+
+    def test_find_lcs_length_wavefront_integer_codes(self):
+        """Test the length of the LCS of integer-coded arrays."""
+
+        self.assertEqual(3, lcs_length_wavefront(array("i", [2, 4, 3, 1, 2]),
+                                                 array("i", [1, 2, 3, 2])))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_find_expected_lcs_of_lists(self, seq_a, seq_b, expected_lcs):
+        """Test that lists give the subsequence as a list of items."""
+
+        self.assertEqual(list(expected_lcs),
+                         longest_common_subsequence(list(seq_a), list(seq_b)))
+
+    def test_find_lcs_of_tokens(self):
+        """Test finding the longest common subsequence of tuples of words."""
+
+        seq_a = tuple("the quick brown fox jumps".split())
+        seq_b = tuple("the slow brown dog jumps".split())
+
+        self.assertEqual(["the", "brown", "jumps"],
+                         longest_common_subsequence(seq_a, seq_b))
+
+    @parameterized.expand([("table", False), ("linear_space", True)])
+    def test_alignment_indices(self, _, linear_space):
+        """Test that the alignment has indices of the items in both inputs."""
+
+        self.assertEqual(LCSAlignment(indices_a=[1, 2, 4],
+                                      indices_b=[1, 2, 3],
+                                      subsequence=["B", "C", "B"]),
+                         lcs_alignment("ABCAB", "DBCB", linear_space))
+
+    def test_linear_space_finds_same_subsequence(self):
+        """Test that both methods find the same one of several subsequences.
+
+        Small alphabets give many longest common subsequences of the same
+        length, which Hirschberg's method has to break ties between in the
+        same way as the table."""
+
+        generator = random.Random(0)
+
+        for _ in range(0, 500):
+            seq_a = [generator.randint(0, 3)
+                     for _ in range(0, generator.randint(0, 20))]
+            seq_b = [generator.randint(0, 3)
+                     for _ in range(0, generator.randint(0, 20))]
+
+            self.assertEqual(longest_common_subsequence(seq_a, seq_b),
+                             longest_common_subsequence(seq_a, seq_b,
+                                                        linear_space=True))
+
+
+class TestDiff(TestCase):
+
+    """Test cases for diff."""
+
+    def test_diff_strings(self):
+        """Test the edit script for the example in Myers' paper."""
+
+        self.assertEqual([
+            DiffEdit(DiffOperation.Delete, 0, None, "A"),
+            DiffEdit(DiffOperation.Delete, 1, None, "B"),
+            DiffEdit(DiffOperation.Equal, 2, 0, "C"),
+            DiffEdit(DiffOperation.Insert, None, 1, "B"),
+            DiffEdit(DiffOperation.Equal, 3, 2, "A"),
+            DiffEdit(DiffOperation.Equal, 4, 3, "B"),
+            DiffEdit(DiffOperation.Delete, 5, None, "B"),
+            DiffEdit(DiffOperation.Equal, 6, 4, "A"),
+            DiffEdit(DiffOperation.Insert, None, 5, "C")
+        ], diff("ABCABBA", "CBABAC"))
+
+    def test_diff_lines(self):
+        """Test diffing lists of lines."""
+
+        old_lines = ["[section]", "key = 1", "other = 2", "last = 3"]
+        new_lines = ["[section]", "key = 10", "other = 2", "last = 3", ""]
+
+        self.assertEqual([
+            DiffEdit(DiffOperation.Equal, 0, 0, "[section]"),
+            DiffEdit(DiffOperation.Delete, 1, None, "key = 1"),
+            DiffEdit(DiffOperation.Insert, None, 1, "key = 10"),
+            DiffEdit(DiffOperation.Equal, 2, 2, "other = 2"),
+            DiffEdit(DiffOperation.Equal, 3, 3, "last = 3"),
+            DiffEdit(DiffOperation.Insert, None, 4, "")
+        ], diff(old_lines, new_lines))
+
+    @parameterized.expand(LONGEST_COMMON_SUBSEQUENCE_TEST_DATA)
+    def test_equal_items_are_lcs(self, seq_a, seq_b, expected_lcs):
+        """Test that the equal items are a longest common subsequence."""
+
+        self.assertEqual(len(expected_lcs),
+                         len([e for e in diff(seq_a, seq_b)
+                              if e.operation == DiffOperation.Equal]))
@@ -0,0 +1,87 @@
+# /tests/pattern_match_benchmark_test.py
+#
+# Test cases for artificialintelligence.pattern_match_benchmark
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.pattern_match_benchmark."""
+
+from artificialintelligence.pattern_match_benchmark import (COMPILED_ALGORITHMS,
+                                                            BenchmarkResult,
+                                                            benchmark_cases,
+                                                            run_benchmarks,
+                                                            write_report)
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+import csv
+
+import json
+
+
+def _small_benchmark():
+    """Run every matcher on a few tiny cases."""
+
+    return list(run_benchmarks(benchmark_cases(text_lengths=[200],
+                                               pattern_lengths=[3, 8],
+                                               alphabet_sizes=[4, 300],
+                                               match_densities=[0.01]),
+                               repeat=1))
+
+
+class TestPatternMatchBenchmark(TestCase):
+
+    """Test cases for the pattern matching benchmarks."""
+
+    def test_all_matchers_agree(self):
+        """Test that every matcher finds the same number of matches.
+
+        The base 10 robin_karp matcher is left out, since it only works on
+        lowercase letters."""
+
+        results = _small_benchmark()
+        matches_by_case = {}
+
+        for result in results:
+            if result.algorithm == "robin_karp":
+                continue
+
+            case = (result.corpus,
+                    result.pattern_length,
+                    result.alphabet_size)
+            matches_by_case.setdefault(case, set()).add(result.matches)
+
+        for matches in matches_by_case.values():
+            self.assertEqual(1, len(matches))
+
+    def test_scan_timed_apart_from_preprocessing(self):
+        """Test that only compiled matchers have a scan time and throughput."""
+
+        for result in _small_benchmark():
+            compiled = result.algorithm in COMPILED_ALGORITHMS
+
+            self.assertEqual((compiled, compiled),
+                             (result.scan_seconds is not None,
+                              result.throughput_mb_per_second is not None))
+            self.assertTrue(result.total_seconds is not None)
+
+    @parameterized.expand([
+        ("json", lambda s: json.loads(s)),
+        ("csv", lambda s: list(csv.DictReader(StringIO(s))))
+    ])
+    def test_write_report(self, report_format, parse):
+        """Test that reports have a row with every field for each result."""
+
+        results = _small_benchmark()
+        stream = StringIO()
+        write_report(results, stream, report_format)
+        rows = parse(stream.getvalue())
+
+        self.assertEqual(len(results), len(rows))
+        self.assertEqual(sorted(BenchmarkResult._fields), sorted(rows[0].keys()))
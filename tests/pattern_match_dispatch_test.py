@@ -0,0 +1,78 @@
+# /tests/pattern_match_dispatch_test.py
+#
+# Test cases for artificialintelligence.pattern_match_dispatch
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.pattern_match_dispatch."""
+
+from artificialintelligence.naive_pattern_match import match_pattern_naive
+from artificialintelligence.pattern_match_dispatch import (CANDIDATE_ALGORITHMS,
+                                                           CostModel,
+                                                           calibrate,
+                                                           choose_algorithm,
+                                                           default_cost_model,
+                                                           find_all)
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+import os
+
+import shutil
+
+import tempfile
+
+
+def _cost_model_favouring(favourite):
+    """Return a CostModel where favourite is always cheapest."""
+
+    costs = default_cost_model().costs
+    return CostModel(dict((algorithm, dict((key, (0.0, 0.0) if
+                                            algorithm == favourite else
+                                            (1.0, 1.0))
+                                           for key in costs[algorithm]))
+                          for algorithm in costs))
+
+
+class TestFindAll(TestCase):
+
+    """Test cases for find_all."""
+
+    @parameterized.expand([
+        ("ab", "ab" * 500),
+        ("daef", "dedfadaefdeafdaef"),
+        ("abcdefghijklmnopqrstuvwxyz" * 4,
+         "abcdefghijklmnopqrstuvwxyz" * 40),
+        ("aaaa", "a" * 300)
+    ])
+    def test_find_all_matches_naive(self, pattern, text):
+        """Test that find_all finds the same matches as the naive matcher."""
+
+        self.assertEqual(match_pattern_naive(pattern, text),
+                         find_all(pattern, text, default_cost_model()))
+
+    @parameterized.expand([(a, ) for a in CANDIDATE_ALGORITHMS])
+    def test_choose_cheapest_algorithm(self, algorithm):
+        """Test that the algorithm with the lowest cost is chosen."""
+
+        self.assertEqual(algorithm,
+                         choose_algorithm("abc",
+                                          "abcabc",
+                                          _cost_model_favouring(algorithm)))
+
+    def test_calibrated_cost_model_round_trips(self):
+        """Test that a calibrated cost model can be saved and loaded."""
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "costs", "pattern_match_costs.json")
+
+        cost_model = calibrate(None, text_length=100, repeat=1)
+        cost_model.save(path)
+        loaded = CostModel.load(path)
+
+        self.assertEqual(sorted(CANDIDATE_ALGORITHMS),
+                         sorted(loaded.costs.keys()))
+        self.assertEqual(cost_model.choose(8, 10000, 26),
+                         loaded.choose(8, 10000, 26))
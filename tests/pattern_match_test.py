@@ -6,10 +6,27 @@
 """Test cases for usage of polysquarecmakelinter.main()."""
 
 from artificialintelligence.naive_pattern_match import match_pattern_naive
-from artificialintelligence.robin_karp_pattern_match import (match_pattern_robin_karp,
-                                                             match_pattern_generic_rabin_karp)
+from artificialintelligence.robin_karp_pattern_match import (RabinKarpStatistics,
+                                                             match_pattern_robin_karp,
+                                                             match_pattern_double_hash_rabin_karp,
+                                                             match_pattern_generic_rabin_karp,
+                                                             match_patterns_rabin_karp)
 from artificialintelligence.kmp_pattern_match import match_pattern_kmp
-from artificialintelligence.boyer_moore_pattern_match import match_pattern_boyer_moore
+from artificialintelligence.vectorized_pattern_match import match_pattern_vectorized
+from artificialintelligence.shift_and_pattern_match import match_pattern_shift_and
+from artificialintelligence.boyer_moore_pattern_match import (match_pattern_boyer_moore,
+                                                              match_pattern_boyer_moore_linear)
+from artificialintelligence.aho_corasick_pattern_match import match_patterns_aho_corasick
+from artificialintelligence import compiled_pattern_match
+from artificialintelligence.streaming_pattern_match import stream_pattern_matches
+from artificialintelligence.parallel_pattern_match import match_pattern_parallel
+
+from io import BytesIO
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 from nose_parameterized import parameterized
 
@@ -19,10 +36,36 @@ pattern_matching_functions = {
     "NaiveMatch": match_pattern_naive,
     "RobinKarp": match_pattern_robin_karp,
     "GenericRabinKarp": match_pattern_generic_rabin_karp,
+    "DoubleHashRabinKarp": match_pattern_double_hash_rabin_karp,
     "KMPMatch":  match_pattern_kmp,
-    "BoyerMooreMatch": match_pattern_boyer_moore
+    "VectorizedMatch": match_pattern_vectorized,
+    "ShiftAndMatch": match_pattern_shift_and,
+    "BoyerMooreMatch": match_pattern_boyer_moore,
+    "BoyerMooreLinearMatch": match_pattern_boyer_moore_linear,
+    "AhoCorasickMatch": lambda p, t: [o for _, o in
+                                      match_patterns_aho_corasick([p], t)],
+    "MultipleRabinKarpMatch": lambda p, t: [o for _, o in
+                                            match_patterns_rabin_karp([p], t)]
 }
 
+for algorithm in compiled_pattern_match.ALGORITHMS.keys():
+    pattern_matching_functions["Compiled_{0}".format(algorithm)] = (
+        lambda a: lambda p, t: list(compiled_pattern_match.compile(p, a).finditer(t))
+    )(algorithm)
+    pattern_matching_functions["Streaming_{0}".format(algorithm)] = (
+        lambda a: lambda p, t: list(stream_pattern_matches(p,
+                                                           StringIO(t),
+                                                           a,
+                                                           chunk_size=2))
+    )(algorithm)
+    pattern_matching_functions["Parallel_{0}".format(algorithm)] = (
+        lambda a: lambda p, t: match_pattern_parallel(p,
+                                                      t,
+                                                      a,
+                                                      workers=2,
+                                                      shard_size=3)
+    )(algorithm)
+
 tests = {}
 
 def _create_pattern_match_test(name, match_function):
@@ -43,7 +86,11 @@ def _create_pattern_match_test(name, match_function):
         @parameterized.expand([
             ("abc", "abbabcabba", [3]),
             ("daef", "dedfadaefdeafdaef", [5, 13]),
-            ("abcab", "abcabcabcab", [0, 3, 6])
+            ("abcab", "abcabcabcab", [0, 3, 6]),
+            ("aa", "aaaa", [0, 1, 2]),
+            ("aba", "bbabbbabababa", [6, 8, 10]),
+            ("cc", "cbacccababa", [3, 4]),
+            ("abcd", "abc", [])
         ])
         def test_find_alpha_patterns(self, pattern, haystack, expected_matches):
             """Test finding some simple alphabetical patterns."""
@@ -62,3 +109,169 @@ for name, test in tests.items():
     exec("{0} = test".format(name))
     del test
 
+
+class TestLimitedPatternMatch(TestCase):
+
+    """Test cases for the limit, search and exists modes."""
+
+    @parameterized.expand([
+        ("NaiveMatch", match_pattern_naive),
+        ("RobinKarp", match_pattern_robin_karp),
+        ("GenericRabinKarp", match_pattern_generic_rabin_karp),
+        ("DoubleHashRabinKarp", match_pattern_double_hash_rabin_karp),
+        ("KMPMatch", match_pattern_kmp),
+        ("BoyerMooreMatch", match_pattern_boyer_moore),
+        ("BoyerMooreLinearMatch", match_pattern_boyer_moore_linear)
+    ])
+    def test_limit_matches(self, name, match_function):
+        """Test that only the first limit matches are returned."""
+
+        self.assertEqual([0, 3],
+                         match_function("abcab", "abcabcabcab", limit=2))
+        self.assertEqual([], match_function("abcab", "abcabcabcab", limit=0))
+
+    @parameterized.expand([(a, ) for a in compiled_pattern_match.ALGORITHMS])
+    def test_search_and_exists(self, algorithm):
+        """Test finding the first match and checking if there is one."""
+
+        self.assertEqual(3, compiled_pattern_match.search("abc",
+                                                          "abbabcabba",
+                                                          algorithm))
+        self.assertTrue(compiled_pattern_match.exists("abc",
+                                                      "abbabcabba",
+                                                      algorithm))
+        self.assertFalse(compiled_pattern_match.exists("abd",
+                                                       "abbabcabba",
+                                                       algorithm))
+
+    def test_search_stops_at_first_match(self):
+        """Test that search does not look past the first match."""
+
+        def text():
+            """Yield a match, then fail if any more is read."""
+
+            for char in "xxabc":
+                yield char
+
+            raise AssertionError("Read past the first match")
+
+        self.assertEqual(2, compiled_pattern_match.compile("abc").search(text()))
+
+    def test_boyer_moore_limit_does_not_read_whole_text(self):
+        """Test that the tables are not built from the whole text."""
+
+        class Text(str):
+
+            """A text which fails if all of its characters are read."""
+
+            def __iter__(self):
+                """Fail, since only the first match should be looked at."""
+
+                raise AssertionError("Read the whole text")
+
+        self.assertEqual([2], match_pattern_boyer_moore("abc",
+                                                        Text("xxabcabc"),
+                                                        limit=1))
+
+
+class TestDoubleHashRabinKarp(TestCase):
+
+    """Test cases for the double hash Rabin-Karp matcher."""
+
+    def test_long_pattern_with_many_matches(self):
+        """Test that long patterns match exactly with no spurious hits."""
+
+        pattern = "thequickbrownfoxjumpsoverthelazydog"
+        text = "x".join([pattern] * 50)
+        statistics = RabinKarpStatistics()
+
+        self.assertEqual(list(range(0, len(text), len(pattern) + 1)),
+                         match_pattern_double_hash_rabin_karp(pattern,
+                                                              text,
+                                                              statistics))
+        self.assertEqual(50, statistics.hash_hits)
+        self.assertEqual(0, statistics.spurious_hits)
+
+
+class TestMultiplePatternMatch(TestCase):
+
+    """Test cases for matching many patterns at once."""
+
+    @parameterized.expand([
+        (["he", "she", "his", "hers"], "ushers", [(1, 1), (0, 2), (3, 2)]),
+        (["a", "aa", "aaa"], "aaa", [(0, 0), (1, 0), (0, 1),
+                                     (2, 0), (1, 1), (0, 2)]),
+        (["abc", "xyz"], "ababab", [])
+    ])
+    def test_find_many_patterns(self, patterns, haystack, expected_matches):
+        """Test finding many patterns in one pass."""
+
+        self.assertEqual(expected_matches,
+                         match_patterns_aho_corasick(patterns, haystack))
+
+    @parameterized.expand([
+        (["he", "she", "his", "hers"], "ushers", [(1, 1), (0, 2), (3, 2)]),
+        (["ab", "ba", "ab", "abc"], "abcab", [(0, 0), (2, 0), (3, 0),
+                                             (0, 3), (2, 3)]),
+        (["abc", "xyz"], "ababab", [])
+    ])
+    def test_find_many_patterns_rabin_karp(self,
+                                           patterns,
+                                           haystack,
+                                           expected_matches):
+        """Test finding many patterns with one rolling hash per length."""
+
+        self.assertEqual(expected_matches,
+                         match_patterns_rabin_karp(patterns, haystack))
+
+
+class TestCompiledPattern(TestCase):
+
+    """Test cases for compiled patterns."""
+
+    @parameterized.expand([(a, ) for a in compiled_pattern_match.ALGORITHMS])
+    def test_reuse_compiled_pattern(self, algorithm):
+        """Test that a compiled pattern can be matched many times."""
+
+        compiled = compiled_pattern_match.compile("daef", algorithm)
+
+        self.assertEqual(5, compiled.search("dedfadaefdeafdaef"))
+        self.assertEqual(2, compiled.count("dedfadaefdeafdaef"))
+        self.assertEqual(None, compiled.search("abbabcabba"))
+        self.assertEqual(0, compiled.count("abbabcabba"))
+
+    def test_unknown_algorithm(self):
+        """Test that compiling with an unknown algorithm raises ValueError."""
+
+        self.assertRaises(ValueError,
+                          compiled_pattern_match.compile,
+                          "abc",
+                          "unknown")
+
+
+class TestStreamingPatternMatch(TestCase):
+
+    """Test cases for matching over streams of chunks."""
+
+    @parameterized.expand([(a, ) for a in compiled_pattern_match.ALGORITHMS])
+    def test_match_across_chunk_boundaries(self, algorithm):
+        """Test that matches spanning chunks are found at absolute offsets."""
+
+        chunks = ["ded", "f", "adae", "fdeafd", "aef"]
+
+        self.assertEqual([5, 13],
+                         list(stream_pattern_matches("daef",
+                                                     iter(chunks),
+                                                     algorithm)))
+
+    @parameterized.expand([(a, ) for a in compiled_pattern_match.ALGORITHMS])
+    def test_match_binary_file(self, algorithm):
+        """Test matching bytes read from a binary file object."""
+
+        stream = BytesIO(b"abcabcabcab")
+
+        self.assertEqual([0, 3, 6],
+                         list(stream_pattern_matches(b"abcab",
+                                                     stream,
+                                                     algorithm,
+                                                     chunk_size=4)))
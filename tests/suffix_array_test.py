@@ -0,0 +1,77 @@
+# /tests/suffix_array_test.py
+#
+# Test cases for artificialintelligence.suffix_array
+#
+# See LICENCE.md for Copyright information
+"""Test cases for usage of artificialintelligence.suffix_array."""
+
+from artificialintelligence.naive_pattern_match import match_pattern_naive
+from artificialintelligence.suffix_array import (SuffixArrayIndex,
+                                                 calculate_lcp_array,
+                                                 calculate_suffix_array)
+
+from nose_parameterized import parameterized
+
+from testtools import TestCase
+
+import os
+
+import tempfile
+
+TEXT = "dedfadaefdeafdaefabcabcabcab"
+
+
+class TestSuffixArray(TestCase):
+
+    """Test cases for building suffix arrays."""
+
+    def test_suffix_array(self):
+        """Test that suffixes are sorted."""
+
+        self.assertEqual([5, 3, 1, 0, 4, 2],
+                         list(calculate_suffix_array("banana")))
+
+    def test_lcp_array(self):
+        """Test the longest common prefix of each adjacent pair of suffixes."""
+
+        self.assertEqual([0, 1, 3, 0, 0, 2],
+                         list(calculate_lcp_array("banana",
+                                                  calculate_suffix_array("banana"))))
+
+
+class TestSuffixArrayIndex(TestCase):
+
+    """Test cases for querying a SuffixArrayIndex."""
+
+    @parameterized.expand([
+        ("daef", ),
+        ("abcab", ),
+        ("a", ),
+        ("xyz", ),
+        ("dedfadaefdeafdaefabcabcabcabx", )
+    ])
+    def test_occurrences_and_count(self, pattern):
+        """Test finding the same occurrences as the naive matcher."""
+
+        index = SuffixArrayIndex(TEXT)
+        expected = match_pattern_naive(pattern, TEXT)
+
+        self.assertEqual(expected, index.occurrences(pattern))
+        self.assertEqual(len(expected), index.count(pattern))
+
+    @parameterized.expand([
+        ("str", TEXT, "abcab"),
+        ("bytes", TEXT.encode("utf-8"), b"abcab")
+    ])
+    def test_save_and_load(self, name, text, pattern):
+        """Test that a saved index can be loaded and queried."""
+
+        file_descriptor, path = tempfile.mkstemp()
+        os.close(file_descriptor)
+        self.addCleanup(os.remove, path)
+
+        SuffixArrayIndex(text).save(path)
+        index = SuffixArrayIndex.load(path)
+
+        self.assertEqual(text, index.text)
+        self.assertEqual([17, 20, 23], index.occurrences(pattern))